@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Loan Predictor Benchmarks
+Times every hot path on synthetic data at several scales and compares runs for regressions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import simple_loan_predictor as predictor
+from generate_loan_data import generate_loan_columns, write_loan_csv
+
+DEFAULT_SIZES = (1000, 100000, 1000000, 10000000)
+CHUNK_ROWS = 100000
+FIGURE_CALLS = 50
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streamlit_app.py')
+
+def iter_synthetic_chunks(n_rows, seed=0):
+    """Yield synthetic column chunks of at most CHUNK_ROWS rows"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, CHUNK_ROWS):
+        yield generate_loan_columns(rng, min(CHUNK_ROWS, n_rows - start))
+
+class Workspace:
+    """Temporary directory holding one synthetic CSV file per size"""
+    
+    def __init__(self, root=None):
+        self.root = root or tempfile.mkdtemp(prefix='loan-bench-')
+        self._owned = root is None
+    
+    def csv_file(self, n_rows):
+        filename = os.path.join(self.root, f"synthetic_{n_rows}.csv")
+        if not os.path.exists(filename):
+            write_loan_csv(filename, n_rows)
+        return filename
+    
+    def close(self):
+        if self._owned:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+def bench_predict_loan_default(n_rows, workspace):
+    elapsed = 0.0
+    for chunk in iter_synthetic_chunks(n_rows):
+        customers = [dict(zip(chunk, values)) for values in zip(*(v.tolist() for v in chunk.values()))]
+        start = time.perf_counter()
+        for customer in customers:
+            predictor.predict_loan_default(customer)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+def bench_predict_loan_default_cached(n_rows, workspace):
+    predictor.enable_result_cache()
+    try:
+        return bench_predict_loan_default(n_rows, workspace)
+    finally:
+        predictor.disable_result_cache()
+
+def bench_predict_loan_default_batch(n_rows, workspace):
+    elapsed = 0.0
+    for chunk in iter_synthetic_chunks(n_rows):
+        features = np.column_stack([chunk[name] for name in predictor.FEATURE_ORDER]).astype(np.float64)
+        start = time.perf_counter()
+        predictor.predict_loan_default_batch(features)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+def bench_convert_csv_row_to_features(n_rows, workspace):
+    elapsed = 0.0
+    for chunk in iter_synthetic_chunks(n_rows):
+        rows = [dict(zip(chunk, values)) for values in zip(*(v.astype(str).tolist() for v in chunk.values()))]
+        start = time.perf_counter()
+        for row in rows:
+            predictor.convert_csv_row_to_features(row)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+def bench_load_csv_data(n_rows, workspace):
+    filename = workspace.csv_file(n_rows)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_csv_data(filename, sample_size=5, seed=0)
+    return time.perf_counter() - start
+
+def bench_dataset_statistics_cold(n_rows, workspace):
+    filename = workspace.csv_file(n_rows)
+    shutil.rmtree(os.path.join(workspace.root, '.loan_cache'), ignore_errors=True)
+    start = time.perf_counter()
+    predictor._dataset_statistics(filename)
+    return time.perf_counter() - start
+
+def bench_dataset_statistics_warm(n_rows, workspace):
+    filename = workspace.csv_file(n_rows)
+    predictor._dataset_statistics(filename)
+    start = time.perf_counter()
+    predictor._dataset_statistics(filename)
+    return time.perf_counter() - start
+
+def bench_score_csv_file(n_rows, workspace):
+    filename = workspace.csv_file(n_rows)
+    output = os.path.join(workspace.root, 'scored.csv')
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.score_csv_file(filename, output, progress_interval=None)
+    elapsed = time.perf_counter() - start
+    os.remove(output)
+    return elapsed
+
+def bench_evaluate_csv(n_rows, workspace):
+    from loan_evaluation import evaluate_csv
+    
+    filename = workspace.csv_file(n_rows)
+    start = time.perf_counter()
+    evaluate_csv(filename)
+    return time.perf_counter() - start
+
+def _figure_builders():
+    """Import the Streamlit figure builders without a running Streamlit server"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        import streamlit_app
+    return streamlit_app
+
+def bench_create_3d_risk_visualization(calls, workspace):
+    app = _figure_builders()
+    probabilities = np.random.default_rng(0).random(calls)
+    start = time.perf_counter()
+    for probability in probabilities:
+        app.create_3d_risk_visualization(float(probability), "High Risk")
+    return time.perf_counter() - start
+
+def bench_create_probability_gauge(calls, workspace):
+    app = _figure_builders()
+    probabilities = np.random.default_rng(0).random(calls)
+    start = time.perf_counter()
+    for probability in probabilities:
+        app.create_probability_gauge(float(probability))
+    return time.perf_counter() - start
+
+def parse_importtime(report):
+    """
+    Parse the report that python -X importtime writes to stderr
+    
+    Args:
+        report (str): stderr of the interpreter
+    
+    Returns:
+        list: (module, nesting depth, self seconds, cumulative seconds), in
+              the order the imports finished
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return imports
+
+def measure_app_import():
+    """
+    Time importing the Streamlit app in a fresh interpreter
+    
+    Streamlit itself is imported first, so the time covers only what the
+    app adds before its first element can render: its own imports and
+    module-level code.
+    
+    Returns:
+        tuple: (seconds, list of (module, cumulative seconds) imported
+               directly by the app, slowest first)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import streamlit; import streamlit_app'],
+        cwd=os.path.dirname(APP_SCRIPT), capture_output=True, text=True, check=True
+    )
+    imports = parse_importtime(result.stderr)
+    
+    # Children are reported before their parent, one level deeper
+    direct = []
+    seconds = None
+    for name, depth, _, cumulative in imports:
+        if depth == 0 and name == 'streamlit_app':
+            seconds = cumulative
+            break
+        if depth == 0:
+            direct = []
+        elif depth == 1:
+            direct.append((name, cumulative))
+    if seconds is None:
+        raise RuntimeError("streamlit_app missing from the -X importtime report")
+    return seconds, sorted(direct, key=lambda item: item[1], reverse=True)
+
+def measure_first_paint():
+    """
+    Time the app's first script run, which draws the initial page
+    
+    The app runs headless under Streamlit's AppTest in a fresh
+    interpreter, so every cache starts cold as on a new container.
+    
+    Returns:
+        float: Seconds from the start of the run until the page is complete
+    """
+    code = (
+        "import sys, time\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "app = AppTest.from_file(sys.argv[1], default_timeout=120)\n"
+        "start = time.perf_counter()\n"
+        "app.run()\n"
+        "print(time.perf_counter() - start)\n"
+        "sys.exit(1 if app.exception else 0)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code, APP_SCRIPT], cwd=os.path.dirname(APP_SCRIPT),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"The app failed on its first run:\n{result.stderr or result.stdout}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+def bench_app_import(calls, workspace):
+    return measure_app_import()[0]
+
+def bench_app_first_paint(calls, workspace):
+    return measure_first_paint()
+
+# Benchmarks timed once per data size
+ROW_BENCHMARKS = {
+    'predict_loan_default': bench_predict_loan_default,
+    'predict_loan_default_cached': bench_predict_loan_default_cached,
+    'predict_loan_default_batch': bench_predict_loan_default_batch,
+    'convert_csv_row_to_features': bench_convert_csv_row_to_features,
+    'load_csv_data': bench_load_csv_data,
+    'dataset_statistics_cold': bench_dataset_statistics_cold,
+    'dataset_statistics_warm': bench_dataset_statistics_warm,
+    'score_csv_file': bench_score_csv_file,
+    'evaluate_csv': bench_evaluate_csv
+}
+
+# Per-request benchmarks: timed over a fixed number of calls, not per data size
+CALL_BENCHMARKS = {
+    'create_3d_risk_visualization': bench_create_3d_risk_visualization,
+    'create_probability_gauge': bench_create_probability_gauge
+}
+
+# Cold-start benchmarks of the Streamlit app, each in a fresh interpreter
+STARTUP_BENCHMARKS = {
+    'app_import': bench_app_import,
+    'app_first_paint': bench_app_first_paint
+}
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, repeat=3, figure_calls=FIGURE_CALLS, workdir=None):
+    """
+    Run the benchmarks and collect their timings
+    
+    Sizes up to 100k rows are repeated and the best time kept; larger
+    sizes run once.
+    
+    Args:
+        sizes (tuple): Row counts to benchmark
+        names (list): Benchmarks to run (default: all)
+        repeat (int): Repetitions for small sizes
+        figure_calls (int): Calls per figure-builder benchmark
+        workdir (str): Directory for synthetic files (default: a temporary one)
+    
+    Returns:
+        dict: Run metadata and a list of results
+    """
+    selected = set(names) if names else set(ROW_BENCHMARKS) | set(CALL_BENCHMARKS) | set(STARTUP_BENCHMARKS)
+    unknown = selected - set(ROW_BENCHMARKS) - set(CALL_BENCHMARKS) - set(STARTUP_BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    
+    workspace = Workspace(workdir)
+    results = []
+    
+    def record(name, rows, runs, function):
+        seconds = min(function(rows, workspace) for _ in range(runs))
+        results.append({
+            'name': name,
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_sec': rows / seconds if seconds > 0 else None
+        })
+        print(f"{name:<32} {rows:>12,} {seconds:>10.4f}s {rows / seconds if seconds > 0 else 0:>14,.0f}/s")
+    
+    try:
+        print(f"{'Benchmark':<32} {'Rows':>12} {'Time':>11} {'Throughput':>16}")
+        print("-" * 75)
+        for name, function in STARTUP_BENCHMARKS.items():
+            if name in selected:
+                record(name, 1, repeat, function)
+        for name, function in CALL_BENCHMARKS.items():
+            if name in selected:
+                record(name, figure_calls, repeat, function)
+        for n_rows in sizes:
+            runs = repeat if n_rows <= 100000 else 1
+            for name, function in ROW_BENCHMARKS.items():
+                if name in selected:
+                    record(name, n_rows, runs, function)
+    finally:
+        workspace.close()
+    
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'results': results
+    }
+
+def compare_runs(baseline, current, threshold=0.10):
+    """
+    Compare two benchmark runs and flag slowdowns
+    
+    Args:
+        baseline (dict): Earlier run
+        current (dict): Later run
+        threshold (float): Relative slowdown that counts as a regression
+    
+    Returns:
+        list: (name, rows, baseline seconds, current seconds, change, regressed)
+    """
+    previous = {(r['name'], r['rows']): r['seconds'] for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        key = (result['name'], result['rows'])
+        if key not in previous or previous[key] <= 0:
+            continue
+        change = result['seconds'] / previous[key] - 1
+        rows.append((key[0], key[1], previous[key], result['seconds'], change, change > threshold))
+    return rows
+
+def parse_sizes(text):
+    """Parse sizes such as '1k,100k,1M' into row counts"""
+    multipliers = {'k': 1000, 'm': 1000000}
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().lower()
+        if part and part[-1] in multipliers:
+            sizes.append(int(float(part[:-1]) * multipliers[part[-1]]))
+        elif part:
+            sizes.append(int(part))
+    return tuple(sizes)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the loan predictor hot paths")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    
+    run = subcommands.add_parser('run', help="Run benchmarks and write JSON results")
+    run.add_argument('--sizes', default='1k,100k,1M,10M', help="Comma-separated row counts (k/M suffixes)")
+    run.add_argument('--only', nargs='+', metavar='NAME', help="Benchmarks to run")
+    run.add_argument('--repeat', type=int, default=3, help="Repetitions for sizes up to 100k")
+    run.add_argument('--figure-calls', type=int, default=FIGURE_CALLS, help="Calls per figure benchmark")
+    run.add_argument('--workdir', help="Keep synthetic files in this directory")
+    run.add_argument('--out', default='benchmark_results.json', help="JSON file to write")
+    
+    compare = subcommands.add_parser('compare', help="Compare two result files")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help="Relative slowdown flagged as a regression (default 0.10)")
+    
+    subcommands.add_parser('list', help="List benchmark names")
+    
+    startup = subcommands.add_parser('startup', help="Show what the Streamlit app spends its cold start on")
+    startup.add_argument('--top', type=int, default=10, help="Slowest direct imports to list")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'list':
+        for name in list(STARTUP_BENCHMARKS) + list(CALL_BENCHMARKS) + list(ROW_BENCHMARKS):
+            print(name)
+        return 0
+    
+    if args.command == 'startup':
+        seconds, direct = measure_app_import()
+        print(f"📊 streamlit_app import (after streamlit): {seconds * 1000:.1f} ms")
+        for name, cumulative in direct[:args.top]:
+            print(f"  {name:<40} {cumulative * 1000:>9.1f} ms")
+        print(f"📊 First paint (initial script run): {measure_first_paint() * 1000:.1f} ms")
+        return 0
+    
+    if args.command == 'run':
+        report = run_benchmarks(parse_sizes(args.sizes), args.only, args.repeat, args.figure_calls, args.workdir)
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"\n✓ Results written to {args.out}")
+        return 0
+    
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    
+    rows = compare_runs(baseline, current, args.threshold)
+    print(f"{'Benchmark':<32} {'Rows':>12} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    print("-" * 76)
+    for name, n_rows, before, after, change, regressed in rows:
+        marker = " ❌ REGRESSION" if regressed else ""
+        print(f"{name:<32} {n_rows:>12,} {before:>9.4f}s {after:>9.4f}s {change:>+7.1%}{marker}")
+    
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        print(f"\n❌ {regressions} regression(s) above {args.threshold:.0%}")
+        return 1
+    print(f"\n✓ No regressions above {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
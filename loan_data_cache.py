@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Columnar Binary Cache for Loan CSV Files
+Converts a CSV file once into one .npy file per column and memory-maps it on later loads
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from simple_loan_predictor import FEATURE_ORDER
+
+CACHE_DIR_NAME = '.loan_cache'
+CACHE_FORMAT_VERSION = 1
+BUILD_CHUNK_ROWS = 100000
+HASH_BLOCK_SIZE = 1 << 20
+
+def file_sha256(filename):
+    """
+    Hash a file in fixed-size blocks
+    
+    Args:
+        filename (str): Path to file
+    
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _cache_paths(filename, cache_dir):
+    """Return the cache root and manifest path for a CSV file"""
+    source = os.path.abspath(filename)
+    root = cache_dir or os.path.join(os.path.dirname(source), CACHE_DIR_NAME)
+    manifest = os.path.join(root, os.path.basename(source) + '.json')
+    return root, manifest
+
+def _read_manifest(manifest_path):
+    """Load a cache manifest, or None if it is missing or unreadable"""
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != CACHE_FORMAT_VERSION:
+        return None
+    return manifest
+
+def _write_json_atomic(path, data):
+    """Write JSON next to its destination and move it into place"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file, indent=2)
+    os.replace(temp_path, path)
+
+def _column_to_array(values):
+    """Convert one column of CSV strings to float64, or to strings if not numeric"""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+    
+    # Blank cells become NaN; any other non-numeric value makes it a text column
+    converted = np.empty(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        if value.strip() == '':
+            converted[i] = np.nan
+            continue
+        try:
+            converted[i] = float(value)
+        except ValueError:
+            return np.array(values, dtype=np.str_)
+    return converted
+
+def _iter_row_chunks(reader, width, chunk_size):
+    """Yield lists of CSV rows, skipping blank lines and padding short rows as csv.DictReader does"""
+    chunk = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != width:
+            row = (row + [''] * width)[:width]
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _write_column(path, pieces):
+    """
+    Join the chunk files of one column into a single .npy file
+    
+    Only one chunk is in memory at a time. A column that was text in any
+    chunk is stored as text throughout.
+    
+    Args:
+        path (str): Column file to write
+        pieces (list): Chunk files of the column, in row order; they are deleted
+    
+    Returns:
+        tuple: (dtype, number of rows)
+    """
+    arrays = [np.load(piece, mmap_mode='r') for piece in pieces]
+    rows = sum(len(array) for array in arrays)
+    if any(array.dtype.kind == 'U' for array in arrays):
+        dtype = np.result_type(*[array.dtype if array.dtype.kind == 'U' else array[:0].astype(np.str_).dtype
+                                 for array in arrays])
+    else:
+        dtype = np.dtype(np.float64)
+    del arrays
+    
+    with open(path, 'wb') as output:
+        np.lib.format.write_array_header_1_0(output, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (rows,)
+        })
+        for piece in pieces:
+            output.write(np.load(piece).astype(dtype, copy=False).tobytes())
+            os.remove(piece)
+    return dtype, rows
+
+def build_cache(filename, cache_dir=None, source_hash=None, chunk_size=BUILD_CHUNK_ROWS):
+    """
+    Convert a CSV file into one .npy file per column
+    
+    The file is parsed once, chunk by chunk; each chunk's columns are
+    written to disk before the next chunk is read and joined into the
+    column files at the end, so the memory used depends on chunk_size,
+    not on the size of the file.
+    
+    Args:
+        filename (str): Path to CSV file
+        cache_dir (str): Cache directory (default: .loan_cache next to the file)
+        source_hash (str): Precomputed SHA-256 of the file, if already known
+        chunk_size (int): Rows parsed per chunk
+    
+    Returns:
+        dict: The manifest describing the new cache
+    """
+    root, manifest_path = _cache_paths(filename, cache_dir)
+    os.makedirs(root, exist_ok=True)
+    
+    stat = os.stat(filename)
+    source_hash = source_hash or file_sha256(filename)
+    data_dir = os.path.join(root, f"{os.path.basename(filename)}-{source_hash[:16]}")
+    build_dir = f"{data_dir}.{os.getpid()}.build"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+    
+    # Parse in chunks and spill every column of every chunk to its own
+    # file, so the memory used depends on chunk_size, not on the file
+    with open(filename, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        pieces = [[] for _ in header]
+        for number, chunk in enumerate(_iter_row_chunks(reader, len(header), chunk_size)):
+            for index, values in enumerate(zip(*chunk)):
+                piece = os.path.join(build_dir, f"col{index:04d}.part{number:06d}.npy")
+                np.save(piece, _column_to_array(values))
+                pieces[index].append(piece)
+    
+    columns = {}
+    rows = 0
+    for index, name in enumerate(header):
+        column_file = f"col{index:04d}.npy"
+        dtype, rows = _write_column(os.path.join(build_dir, column_file), pieces[index])
+        columns[name] = {'file': column_file, 'dtype': dtype.str}
+    
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.replace(build_dir, data_dir)
+    
+    manifest = {
+        'format_version': CACHE_FORMAT_VERSION,
+        'source': os.path.abspath(filename),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': source_hash,
+        'rows': rows,
+        'data_dir': os.path.basename(data_dir),
+        'columns': columns
+    }
+    
+    previous = _read_manifest(manifest_path)
+    _write_json_atomic(manifest_path, manifest)
+    
+    # Drop the data of the cache this one replaced
+    if previous and previous['data_dir'] != manifest['data_dir']:
+        shutil.rmtree(os.path.join(root, previous['data_dir']), ignore_errors=True)
+    
+    return manifest
+
+def ensure_cache(filename, cache_dir=None, verify_hash=False):
+    """
+    Return an up-to-date cache manifest, rebuilding the cache if needed
+    
+    Size and mtime are checked on every call. The file is hashed only when
+    they changed (or when verify_hash is set), so touching a file without
+    editing it does not trigger a rebuild.
+    
+    Args:
+        filename (str): Path to CSV file
+        cache_dir (str): Cache directory (default: .loan_cache next to the file)
+        verify_hash (bool): Always compare the content hash
+    
+    Returns:
+        dict: Cache manifest
+    """
+    root, manifest_path = _cache_paths(filename, cache_dir)
+    manifest = _read_manifest(manifest_path)
+    stat = os.stat(filename)
+    
+    if manifest and not os.path.isdir(os.path.join(root, manifest['data_dir'])):
+        manifest = None
+    
+    if manifest:
+        unchanged = manifest['size'] == stat.st_size and manifest['mtime_ns'] == stat.st_mtime_ns
+        if unchanged and not verify_hash:
+            return manifest
+        
+        source_hash = file_sha256(filename)
+        if manifest['size'] == stat.st_size and manifest['sha256'] == source_hash:
+            if not unchanged:
+                manifest['mtime_ns'] = stat.st_mtime_ns
+                _write_json_atomic(manifest_path, manifest)
+            return manifest
+        return build_cache(filename, cache_dir, source_hash)
+    
+    return build_cache(filename, cache_dir)
+
+def load_columns(filename, columns=None, cache_dir=None, verify_hash=False):
+    """
+    Load columns of a CSV file from its binary cache as memory-mapped arrays
+    
+    Args:
+        filename (str): Path to CSV file
+        columns (list): Column names to load (default: all)
+        cache_dir (str): Cache directory (default: .loan_cache next to the file)
+        verify_hash (bool): Always compare the content hash before loading
+    
+    Returns:
+        dict: Column name to read-only numpy array
+    """
+    manifest = ensure_cache(filename, cache_dir, verify_hash)
+    root, _ = _cache_paths(filename, cache_dir)
+    data_dir = os.path.join(root, manifest['data_dir'])
+    
+    names = list(manifest['columns']) if columns is None else columns
+    loaded = {}
+    for name in names:
+        if name not in manifest['columns']:
+            raise KeyError(f"Column '{name}' not found in {filename}")
+        column_file = os.path.join(data_dir, manifest['columns'][name]['file'])
+        loaded[name] = np.load(column_file, mmap_mode='r')
+    return loaded
+
+def load_feature_matrix(filename, cache_dir=None, verify_hash=False):
+    """
+    Load the model features and labels of a CSV file from its binary cache
+    
+    Feature columns missing from the file are filled with 0, as in
+    convert_csv_row_to_features.
+    
+    Args:
+        filename (str): Path to CSV file
+        cache_dir (str): Cache directory (default: .loan_cache next to the file)
+        verify_hash (bool): Always compare the content hash before loading
+    
+    Returns:
+        tuple: ((n_rows, 14) feature matrix in FEATURE_ORDER,
+                Loan_Status_label array or None)
+    """
+    manifest = ensure_cache(filename, cache_dir, verify_hash)
+    available = manifest['columns']
+    wanted = [name for name in FEATURE_ORDER if name in available]
+    if 'Loan_Status_label' in available:
+        wanted.append('Loan_Status_label')
+    columns = load_columns(filename, wanted, cache_dir)
+    
+    features = np.zeros((manifest['rows'], len(FEATURE_ORDER)), dtype=np.float64)
+    for index, name in enumerate(FEATURE_ORDER):
+        if name in columns:
+            features[:, index] = columns[name]
+    
+    return features, columns.get('Loan_Status_label')
+
+if __name__ == "__main__":
+    import sys
+    
+    source = sys.argv[1] if len(sys.argv) > 1 else 'loan_detection.csv'
+    
+    start = time.perf_counter()
+    manifest = ensure_cache(source)
+    print(f"✓ Cache ready for {source}: {manifest['rows']:,} rows, "
+          f"{len(manifest['columns'])} columns ({time.perf_counter() - start:.3f}s)")
+    
+    start = time.perf_counter()
+    features, labels = load_feature_matrix(source)
+    print(f"✓ Loaded feature matrix {features.shape} from cache ({time.perf_counter() - start:.3f}s)")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Loan Model Evaluation
+Scores a whole labelled CSV file in batch and reports the confusion matrix, precision/recall, ROC-AUC, log-loss
+and a full threshold sweep
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from loan_csv_reader import DEFAULT_CHUNK_ROWS, iter_column_chunks
+from simple_loan_predictor import FEATURE_ORDER, get_default_model
+
+SWEEP_METRICS = ('f1', 'accuracy', 'balanced_accuracy', 'youden')
+REPORT_THRESHOLDS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+LOG_LOSS_EPSILON = 1e-15
+
+def score_labelled_csv(filename, model=None, label_column='Loan_Status_label', chunk_size=DEFAULT_CHUNK_ROWS):
+    """
+    Score every row of a labelled CSV file in batch
+    
+    Only the feature and label columns are parsed, one chunk at a time;
+    just the probabilities and labels of all rows are kept.
+    
+    Args:
+        filename (str): Path to CSV file with model features and labels
+        model (LoanModel): Model to evaluate (default: the module-level model)
+        label_column (str): 0/1 target column
+        chunk_size (int): Rows scored per batch
+    
+    Returns:
+        tuple: (float64 probabilities, int8 labels)
+    
+    Raises:
+        ValueError: If the label column is missing or not 0/1
+    """
+    model = model or get_default_model()
+    columns = list(FEATURE_ORDER) + [label_column]
+    probabilities = []
+    labels = []
+    
+    with open(filename, 'r', newline='') as file:
+        for chunk in iter_column_chunks(file, columns, chunk_size, missing=np.nan):
+            label = chunk[:, -1]
+            if np.isnan(label).all():
+                raise ValueError(f"'{label_column}' column not found in {filename}")
+            if not np.isin(label, (0, 1)).all():
+                raise ValueError(f"'{label_column}' must contain only 0 and 1")
+            features = np.ascontiguousarray(chunk[:, :-1])
+            probabilities.append(model.predict_batch(features)['probability'])
+            labels.append(label.astype(np.int8))
+    
+    if not probabilities:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int8)
+    return np.concatenate(probabilities), np.concatenate(labels)
+
+def threshold_sweep(labels, probabilities):
+    """
+    Confusion counts at every distinct decision threshold, from one sort
+    
+    The rows are sorted by probability once; cumulative sums of the
+    labels at the end of each run of equal probabilities then give the
+    true and false positives of every threshold in O(n log n) overall.
+    Threshold i predicts default for probability > thresholds[i], the
+    rule LoanModel uses, so point 0 flags nobody and the last point
+    flags everybody.
+    
+    Args:
+        labels (numpy.ndarray): 0/1 outcomes
+        probabilities (numpy.ndarray): Predicted default probabilities
+    
+    Returns:
+        dict: Descending 'thresholds' with the matching 'tp' and 'fp'
+              counts, plus the 'positives' and 'negatives' totals
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    
+    order = np.argsort(probabilities, kind='stable')[::-1]
+    ranked = probabilities[order]
+    
+    # Last position of each run of equal probabilities
+    ends = np.flatnonzero(np.diff(ranked))
+    if len(ranked):
+        ends = np.append(ends, len(ranked) - 1)
+    tp = np.cumsum(labels[order])[ends]
+    fp = ends + 1 - tp
+    distinct = ranked[ends]
+    
+    # Flagging everybody needs a threshold just below the lowest probability
+    lowest = np.nextafter(distinct[-1:], -np.inf) if len(distinct) else np.array([np.inf])
+    
+    return {
+        'thresholds': np.concatenate([distinct, lowest]),
+        'tp': np.concatenate([[0], tp]),
+        'fp': np.concatenate([[0], fp]),
+        'positives': int(labels.sum()),
+        'negatives': int(len(labels) - labels.sum())
+    }
+
+def sweep_index(sweep, threshold):
+    """Position in a sweep of the point that predicts default for probability > threshold"""
+    return int(np.searchsorted(-sweep['thresholds'][:-1], -threshold, side='left'))
+
+def sweep_metrics(sweep):
+    """
+    Metric curves over every threshold of a sweep
+    
+    Args:
+        sweep (dict): Result of threshold_sweep
+    
+    Returns:
+        dict: Metric name to an array aligned with sweep['thresholds']
+    """
+    tp = sweep['tp'].astype(np.float64)
+    fp = sweep['fp'].astype(np.float64)
+    positives, negatives = sweep['positives'], sweep['negatives']
+    fn = positives - tp
+    tn = negatives - fp
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tpr = tp / positives
+        fpr = fp / negatives
+        return {
+            'precision': np.where(tp + fp > 0, tp / (tp + fp), 0.0),
+            'recall': tpr,
+            'specificity': tn / negatives,
+            'f1': np.where(tp > 0, 2 * tp / (2 * tp + fp + fn), 0.0),
+            'accuracy': (tp + tn) / (positives + negatives),
+            'balanced_accuracy': (tpr + tn / negatives) / 2,
+            'youden': tpr - fpr
+        }
+
+def roc_auc(sweep):
+    """
+    Area under the ROC curve of a sweep
+    
+    Tied probabilities form one straight segment, which gives them half
+    credit as in the Mann-Whitney statistic.
+    
+    Returns:
+        float: ROC-AUC, or NaN when only one class is present
+    """
+    if not sweep['positives'] or not sweep['negatives']:
+        return float('nan')
+    tpr = sweep['tp'] / sweep['positives']
+    fpr = sweep['fp'] / sweep['negatives']
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+def log_loss(labels, probabilities, epsilon=LOG_LOSS_EPSILON):
+    """
+    Mean negative log-likelihood of the labels
+    
+    Args:
+        labels (numpy.ndarray): 0/1 outcomes
+        probabilities (numpy.ndarray): Predicted default probabilities
+        epsilon (float): Probabilities are clipped to [epsilon, 1 - epsilon]
+    
+    Returns:
+        float: Log-loss
+    """
+    if not len(labels):
+        return float('nan')
+    probabilities = np.clip(np.asarray(probabilities, dtype=np.float64), epsilon, 1 - epsilon)
+    return float(-np.mean(np.where(np.asarray(labels) == 1, np.log(probabilities), np.log1p(-probabilities))))
+
+def best_threshold(sweep, metric='f1'):
+    """
+    Threshold of a sweep that maximizes a metric
+    
+    Args:
+        sweep (dict): Result of threshold_sweep
+        metric (str): One of SWEEP_METRICS
+    
+    Returns:
+        tuple: (threshold, metric value)
+    """
+    if metric not in SWEEP_METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {SWEEP_METRICS}")
+    values = np.nan_to_num(sweep_metrics(sweep)[metric], nan=-np.inf)
+    index = int(np.argmax(values))
+    return float(sweep['thresholds'][index]), float(values[index])
+
+def evaluate(labels, probabilities, threshold):
+    """
+    Evaluate predictions at one decision threshold
+    
+    Args:
+        labels (numpy.ndarray): 0/1 outcomes
+        probabilities (numpy.ndarray): Predicted default probabilities
+        threshold (float): Default is predicted for probability > threshold
+    
+    Returns:
+        dict: Confusion matrix, precision, recall, F1, accuracy, ROC-AUC,
+              log-loss and the sweep the threshold-free metrics came from
+    """
+    sweep = threshold_sweep(labels, probabilities)
+    index = sweep_index(sweep, threshold)
+    metrics = sweep_metrics(sweep)
+    tp, fp = int(sweep['tp'][index]), int(sweep['fp'][index])
+    
+    return {
+        'rows': len(labels),
+        'threshold': threshold,
+        'confusion_matrix': {
+            'tp': tp,
+            'fp': fp,
+            'fn': sweep['positives'] - tp,
+            'tn': sweep['negatives'] - fp
+        },
+        'precision': float(metrics['precision'][index]),
+        'recall': float(metrics['recall'][index]),
+        'specificity': float(metrics['specificity'][index]),
+        'f1': float(metrics['f1'][index]),
+        'accuracy': float(metrics['accuracy'][index]),
+        'roc_auc': roc_auc(sweep),
+        'log_loss': log_loss(labels, probabilities),
+        'sweep': sweep
+    }
+
+def evaluate_csv(filename, threshold=None, model=None, label_column='Loan_Status_label'):
+    """
+    Score a labelled CSV file and evaluate the model on every row
+    
+    Args:
+        filename (str): Path to CSV file
+        threshold (float): Decision threshold (default: the model's)
+        model (LoanModel): Model to evaluate (default: the module-level model)
+        label_column (str): 0/1 target column
+    
+    Returns:
+        dict: Result of evaluate
+    """
+    model = model or get_default_model()
+    probabilities, labels = score_labelled_csv(filename, model, label_column)
+    return evaluate(labels, probabilities, model.threshold if threshold is None else threshold)
+
+def report_to_dict(report, metric='f1'):
+    """JSON-ready copy of an evaluation report with the best threshold instead of the raw sweep"""
+    result = {key: value for key, value in report.items() if key != 'sweep'}
+    threshold, value = best_threshold(report['sweep'], metric)
+    result['best_threshold'] = {'metric': metric, 'threshold': threshold, 'value': value}
+    return result
+
+def print_report(report, metric='f1'):
+    """Print an evaluation report with a coarse threshold table"""
+    confusion = report['confusion_matrix']
+    sweep = report['sweep']
+    metrics = sweep_metrics(sweep)
+    
+    print(f"📊 Evaluation on {report['rows']:,} rows at threshold {report['threshold']:.2f}")
+    print(f"{'':<18}{'Pred default':>14}{'Pred no default':>17}")
+    print(f"{'Actual default':<18}{confusion['tp']:>14,}{confusion['fn']:>17,}")
+    print(f"{'Actual no default':<18}{confusion['fp']:>14,}{confusion['tn']:>17,}")
+    print(f"\nAccuracy:  {report['accuracy']:.1%}")
+    print(f"Precision: {report['precision']:.1%}")
+    print(f"Recall:    {report['recall']:.1%}")
+    print(f"F1:        {report['f1']:.3f}")
+    print(f"ROC-AUC:   {report['roc_auc']:.4f}")
+    print(f"Log-loss:  {report['log_loss']:.4f}")
+    
+    print(f"\n📈 Threshold sweep ({len(sweep['thresholds']):,} distinct thresholds)")
+    print(f"{'Threshold':>10} {'Precision':>10} {'Recall':>8} {'F1':>7} {'Accuracy':>9}")
+    for threshold in REPORT_THRESHOLDS:
+        i = sweep_index(sweep, threshold)
+        print(f"{threshold:>10.2f} {metrics['precision'][i]:>10.1%} {metrics['recall'][i]:>8.1%} "
+              f"{metrics['f1'][i]:>7.3f} {metrics['accuracy'][i]:>9.1%}")
+    
+    threshold, value = best_threshold(sweep, metric)
+    print(f"\n✓ Best threshold by {metric}: {threshold:.4g} ({metric} = {value:.4f})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the loan model on a whole labelled CSV file")
+    parser.add_argument('input', nargs='?', default='loan_detection.csv', help="Labelled CSV file")
+    parser.add_argument('--threshold', type=float, help="Decision threshold (default: the model's)")
+    parser.add_argument('--metric', choices=SWEEP_METRICS, default='f1', help="Metric the best threshold maximizes")
+    parser.add_argument('--label-column', default='Loan_Status_label')
+    parser.add_argument('--json', metavar='FILE', help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    report = evaluate_csv(args.input, args.threshold, label_column=args.label_column)
+    elapsed = time.perf_counter() - start
+    
+    print_report(report, args.metric)
+    print(f"Evaluated in {elapsed:.2f}s ({report['rows'] / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+    
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report_to_dict(report, args.metric), file, indent=2)
+        print(f"✓ Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
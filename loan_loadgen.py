@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Loan Scoring Service
+Drives /score with concurrent keep-alive clients and reports throughput and latency
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from simple_loan_predictor import FEATURE_ORDER
+
+def random_customer(rng):
+    """Build a random applicant with plausible feature values"""
+    customer = {name: rng.randint(0, 1) for name in FEATURE_ORDER}
+    customer['age'] = rng.randint(18, 90)
+    customer['campaign'] = rng.randint(1, 10)
+    customer['pdays'] = rng.choice([999, rng.randint(0, 30)])
+    customer['previous'] = rng.randint(0, 3)
+    return customer
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def _client(host, port, bodies, latencies):
+    """Send requests one after another over a single keep-alive connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (
+                f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            if b' 200 ' not in status_line:
+                raise RuntimeError(f"Unexpected response: {status_line.decode().strip()}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+async def run_load(host, port, requests=20000, concurrency=64, seed=0):
+    """
+    Send requests to /score from concurrent clients
+    
+    Args:
+        host (str): Server host
+        port (int): Server port
+        requests (int): Total number of requests
+        concurrency (int): Number of simultaneous connections
+        seed (int): Seed for the random applicants
+    
+    Returns:
+        dict: Requests, seconds, requests per second and latency percentiles (ms)
+    """
+    rng = random.Random(seed)
+    bodies = [json.dumps(random_customer(rng)).encode() for _ in range(requests)]
+    per_client = [bodies[i::concurrency] for i in range(concurrency)]
+    
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, chunk, latencies) for chunk in per_client if chunk))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000
+    }
+
+def print_report(label, stats):
+    print(f"{label:<22} {stats['requests_per_sec']:>10,.0f} {stats['p50_ms']:>9.2f} "
+          f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+
+async def _wait_for_port(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+def run_against_server(window_ms, max_batch, args):
+    """Start a server subprocess with the given batch window, load it and stop it"""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'loan_server.py'), '--port', str(args.port),
+         '--batch-window-ms', str(window_ms), '--max-batch', str(max_batch)],
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(_wait_for_port(args.host, args.port))
+        return asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency, args.seed))
+    finally:
+        server.terminate()
+        server.wait()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for loan_server.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', action='store_true',
+                        help="Start the server without and with micro-batching and compare both")
+    parser.add_argument('--batch-window-ms', type=float, default=2.0, help="Window used by --compare")
+    parser.add_argument('--max-batch', type=int, default=256, help="Max batch used by --compare")
+    args = parser.parse_args(argv)
+    
+    print(f"{'Server':<22} {'req/sec':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 63)
+    if args.compare:
+        print_report("no batching", run_against_server(0, 1, args))
+        print_report(f"batched ({args.batch_window_ms:g} ms)",
+                     run_against_server(args.batch_window_ms, args.max_batch, args))
+    else:
+        print_report(f"{args.host}:{args.port}",
+                     asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency, args.seed)))
+
+if __name__ == "__main__":
+    main()
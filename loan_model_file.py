@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Versioned Model Files
+Saves the loan model as a small checksummed JSON file and hot-reloads it in long-running processes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from simple_loan_predictor import FEATURE_ORDER, LoanModel
+
+MODEL_FORMAT = 'loan-logistic-regression'
+MODEL_FORMAT_VERSION = 1
+DEFAULT_CHECK_INTERVAL = 2.0
+MODEL_FIELDS = ('version', 'feature_order', 'weights', 'intercept', 'threshold', 'risk_bands')
+
+def model_checksum(document):
+    """
+    SHA-256 of a model document, ignoring its checksum field
+    
+    The document is hashed in canonical form (sorted keys, no
+    whitespace), so reformatting the file does not change the checksum.
+    
+    Args:
+        document (dict): Model document
+    
+    Returns:
+        str: Hex digest
+    """
+    payload = {key: value for key, value in document.items() if key != 'checksum'}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def model_to_document(model, version=None, metadata=None):
+    """
+    Describe a model as a versioned, checksummed document
+    
+    Args:
+        model (LoanModel): Model to save
+        version (str): Model version (default: the current UTC time)
+        metadata (dict): Extra JSON-serializable details, e.g. training stats
+    
+    Returns:
+        dict: Model document
+    """
+    document = {
+        'format': MODEL_FORMAT,
+        'format_version': MODEL_FORMAT_VERSION,
+        'version': version or time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()),
+        'feature_order': list(model.feature_names),
+        'weights': list(model.weights),
+        'intercept': model.intercept,
+        'threshold': model.threshold,
+        'risk_bands': list(model.risk_bands),
+        'metadata': metadata or {}
+    }
+    document['checksum'] = model_checksum(document)
+    return document
+
+def save_model(model, filename, version=None, metadata=None):
+    """
+    Write a model file atomically
+    
+    The file is written next to its destination and moved into place, so
+    a process reloading it never sees a half-written file.
+    
+    Args:
+        model (LoanModel): Model to save
+        filename (str): Path of the model file
+        version (str): Model version (default: the current UTC time)
+        metadata (dict): Extra JSON-serializable details
+    
+    Returns:
+        dict: The document written
+    """
+    document = model_to_document(model, version, metadata)
+    temp_path = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(document, file, indent=2)
+    os.replace(temp_path, filename)
+    return document
+
+def load_model(filename):
+    """
+    Load and verify a model file
+    
+    Args:
+        filename (str): Path of the model file
+    
+    Returns:
+        tuple: (LoanModel, model document)
+    
+    Raises:
+        ValueError: If the file is not a model file of a supported format
+            version, its checksum does not match, or its features are not
+            the model's FEATURE_ORDER
+    """
+    with open(filename, 'r') as file:
+        try:
+            document = json.load(file)
+        except ValueError as e:
+            raise ValueError(f"{filename} is not valid JSON: {e}") from None
+    
+    if not isinstance(document, dict) or document.get('format') != MODEL_FORMAT:
+        raise ValueError(f"{filename} is not a {MODEL_FORMAT} model file")
+    if document.get('format_version') != MODEL_FORMAT_VERSION:
+        raise ValueError(f"{filename} has format version {document.get('format_version')}, "
+                         f"expected {MODEL_FORMAT_VERSION}")
+    if document.get('checksum') != model_checksum(document):
+        raise ValueError(f"{filename} failed its checksum; the file is corrupt or was edited by hand")
+    missing = [key for key in MODEL_FIELDS if key not in document]
+    if missing:
+        raise ValueError(f"{filename} is missing {', '.join(missing)}")
+    if tuple(document['feature_order']) != FEATURE_ORDER or len(document['weights']) != len(FEATURE_ORDER):
+        raise ValueError(f"{filename} features do not match the model's feature order")
+    
+    model = LoanModel(
+        dict(zip(document['feature_order'], document['weights'])),
+        document['intercept'],
+        document['threshold'],
+        tuple(document['risk_bands'])
+    )
+    return model, document
+
+def _file_state(filename):
+    """Identity of a file's current contents, cheap enough to poll"""
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+class ModelReloader:
+    """
+    Serve a model from a file and swap in a new one when the file changes
+    
+    get() looks at the file at most once per check_interval seconds. A
+    changed file is loaded and verified in full before it replaces the
+    current model, in one assignment, so callers always get a complete
+    model and a request that already holds the old one finishes with it.
+    A file that fails to load is reported and ignored until it changes
+    again; the previous model keeps serving.
+    """
+    
+    def __init__(self, filename, check_interval=DEFAULT_CHECK_INTERVAL):
+        """
+        Args:
+            filename (str): Path of the model file; it must load now
+            check_interval (float): Seconds between checks for a new file
+        """
+        self.filename = filename
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        
+        state = _file_state(filename)
+        self._current = load_model(filename)
+        self._state = state
+        self._next_check = time.monotonic() + check_interval
+    
+    def get(self):
+        """
+        Return the current model, reloading it first if the file changed
+        
+        Returns:
+            LoanModel: Current model
+        """
+        if time.monotonic() >= self._next_check:
+            self.check()
+        return self._current[0]
+    
+    @property
+    def document(self):
+        """Model document (version, checksum, metadata) of the current model"""
+        return self._current[1]
+    
+    def check(self):
+        """
+        Reload the model if the file changed since it was last read
+        
+        Returns:
+            bool: True if a new model was swapped in
+        """
+        # Another thread is already checking; keep serving the current model
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                state = _file_state(self.filename)
+            except OSError as e:
+                self.last_error = str(e)
+                return False
+            if state == self._state:
+                return False
+            
+            self._state = state
+            try:
+                loaded = load_model(self.filename)
+            except (OSError, ValueError, TypeError) as e:
+                self.last_error = str(e)
+                print(f"❌ Keeping model {self.document['version']}: could not reload {self.filename}: {e}")
+                return False
+            
+            self._current = loaded
+            self.last_error = None
+            self.reloads += 1
+            print(f"✓ Reloaded model {loaded[1]['version']} from {self.filename}")
+            return True
+        finally:
+            self._lock.release()
+    
+    def status(self):
+        """Version, checksum and reload counters of the current model, for health checks"""
+        return {
+            'file': self.filename,
+            'version': self.document['version'],
+            'checksum': self.document['checksum'],
+            'reloads': self.reloads,
+            'last_error': self.last_error
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create and inspect versioned loan model files")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    
+    export = subcommands.add_parser('export', help="Save the model built into simple_loan_predictor")
+    export.add_argument('output', help="Model file to write")
+    export.add_argument('--version', help="Model version (default: the current UTC time)")
+    
+    show = subcommands.add_parser('show', help="Verify a model file and print its contents")
+    show.add_argument('model', help="Model file to read")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'export':
+        document = save_model(LoanModel(), args.output, args.version, {'source': 'simple_loan_predictor constants'})
+        print(f"✓ Wrote model {document['version']} to {args.output} (checksum {document['checksum'][:12]})")
+        return 0
+    
+    start = time.perf_counter()
+    try:
+        model, document = load_model(args.model)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+    
+    print(f"✓ Model {document['version']} loaded and verified in {elapsed * 1000:.2f} ms")
+    print(f"Checksum: {document['checksum']}")
+    print(f"Threshold: {model.threshold}  Risk bands: {model.risk_bands}  Intercept: {model.intercept:.4f}")
+    for name, weight in zip(model.feature_names, model.weights):
+        print(f"  {name:<30} {weight:>9.4f}")
+    if document['metadata']:
+        print(f"Metadata: {json.dumps(document['metadata'])}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Parallel Sharded CSV Scoring
+Splits a CSV file into line-aligned byte ranges and scores them in worker processes
+"""
+
+import codecs
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from simple_loan_predictor import (
+    iter_csv_feature_chunks, iter_scored_chunks, iter_scored_rows, write_score_header, write_scored_rows
+)
+
+# Bytes read at a time when scanning or streaming a byte range
+RANGE_BLOCK_BYTES = 1 << 20
+_LINE_END = re.compile(rb'\r\n?|\n')
+
+def _next_line_start(file, position, block_size=65536):
+    """
+    Byte offset of the first line start after position
+    
+    Unix, Windows and old Mac line ends are recognized, as in files
+    opened with newline=''.
+    
+    Args:
+        file (file): File opened in binary mode
+        position (int): Byte offset to search from
+        block_size (int): Bytes read at a time
+    
+    Returns:
+        int: Offset just after the first line end at or after position,
+             or the file size if there is none
+    """
+    file.seek(position)
+    while True:
+        block = file.read(block_size)
+        if not block:
+            return position
+        match = _LINE_END.search(block)
+        if match:
+            end = position + match.end()
+            # A '\r' at the end of the block may be the first half of '\r\n'
+            if match.end() == len(block) and block.endswith(b'\r') and file.read(1) == b'\n':
+                end += 1
+            return end
+        position += len(block)
+
+def read_header(filename):
+    """
+    Read the CSV header and the byte offset where the data starts
+    
+    Args:
+        filename (str): Path to CSV file
+    
+    Returns:
+        tuple: (list of column names, byte offset of the first data row)
+    """
+    with open(filename, 'rb') as file:
+        data_start = _next_line_start(file, 0)
+        file.seek(0)
+        line = file.read(data_start)
+    header = next(csv.reader([line.decode('utf-8')]), [])
+    return header, data_start
+
+def shard_byte_ranges(filename, n_shards, data_start=0):
+    """
+    Split a file into byte ranges that start and end on line boundaries
+    
+    Each boundary is moved forward to just after the next line end, so
+    every line belongs to exactly one range. Fields with embedded newlines
+    are not supported.
+    
+    Args:
+        filename (str): Path to file
+        n_shards (int): Number of ranges to aim for
+        data_start (int): Byte offset where the first range starts
+    
+    Returns:
+        list: (start, end) byte offsets; empty ranges are dropped
+    """
+    size = os.path.getsize(filename)
+    step = max(1, (size - data_start) // max(1, n_shards))
+    
+    boundaries = [data_start]
+    with open(filename, 'rb') as file:
+        for i in range(1, n_shards):
+            target = max(data_start + i * step, boundaries[-1])
+            if target >= size:
+                break
+            # Start one byte early in case target already begins a line
+            boundaries.append(min(_next_line_start(file, target - 1), size))
+    boundaries.append(size)
+    
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def _iter_range_lines(filename, start, end, block_size=RANGE_BLOCK_BYTES):
+    """
+    Yield the decoded lines of a byte range that starts and ends on line boundaries
+    
+    Lines keep their Unix, Windows or old Mac line end, as in files opened
+    with newline=''. The range is read in blocks, so memory does not
+    depend on its size.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        partial = ''
+        while remaining > 0:
+            block = file.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            lines = io.StringIO(partial + decoder.decode(block), newline='').readlines()
+            # The last line may go on in the next block; a final '\r' may be half of '\r\n'
+            partial = lines.pop() if remaining > 0 and lines else ''
+            yield from lines
+        partial += decoder.decode(b'', final=True)
+        if partial:
+            yield partial
+
+def count_rows(filename, start, end):
+    """
+    Count the non-blank lines in a byte range
+    
+    Args:
+        filename (str): Path to CSV file
+        start (int): First byte of the range
+        end (int): End of the range (exclusive)
+    
+    Returns:
+        int: Number of data rows in the range
+    """
+    return sum(1 for line in _iter_range_lines(filename, start, end) if line.strip())
+
+def score_shard(filename, header, start, end, first_row, shard_filename, chunk_size=10000,
+                output_format='csv'):
+    """
+    Score one byte range of a CSV file into its own output file
+    
+    Args:
+        filename (str): Path to CSV file
+        header (list): Column names of the CSV file
+        start (int): First byte of the range
+        end (int): End of the range (exclusive)
+        first_row (int): Row number of the first row in the range
+        shard_filename (str): Path of the scored rows to write (no header)
+        chunk_size (int): Rows scored per batch
+        output_format (str): 'csv' or 'jsonl'
+    
+    Returns:
+        int: Number of rows scored
+    """
+    feature_chunks = iter_csv_feature_chunks(_iter_range_lines(filename, start, end), chunk_size, header, first_row)
+    rows_scored = 0
+    
+    with open(shard_filename, 'w', newline='') as output:
+        for result in iter_scored_chunks(feature_chunks):
+            write_scored_rows(output, iter_scored_rows(result, first_row + rows_scored), output_format)
+            rows_scored += len(result['probability'])
+    
+    return rows_scored
+
+def score_csv_file_parallel(input_filename, output_filename, workers=None, chunk_size=10000,
+                            shards_per_worker=4, output_format='csv'):
+    """
+    Score a CSV file with a pool of worker processes
+    
+    The data is split into line-aligned byte ranges. Workers first count
+    the rows of each range, so every shard knows its global row numbers,
+    then score their ranges into separate files. The shard files are
+    concatenated in order, giving the same rows as score_csv_file
+    (probabilities can differ in the last digit where chunk boundaries
+    fall differently).
+    
+    Args:
+        input_filename (str): Path to CSV file with model features
+        output_filename (str): Path of the scored CSV to write
+        workers (int): Worker processes (default: number of CPUs)
+        chunk_size (int): Rows scored per batch inside each worker
+        shards_per_worker (int): Ranges per worker, to even out the load
+        output_format (str): 'csv' or 'jsonl'
+    
+    Returns:
+        dict: Rows scored, elapsed seconds, rows per second and workers used
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    
+    header, data_start = read_header(input_filename)
+    ranges = shard_byte_ranges(input_filename, workers * shards_per_worker, data_start)
+    
+    output_dir = os.path.dirname(os.path.abspath(output_filename))
+    shard_dir = tempfile.mkdtemp(prefix='.shards-', dir=output_dir)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            starts = [start for start, _ in ranges]
+            ends = [end for _, end in ranges]
+            counts = list(pool.map(count_rows, repeat(input_filename), starts, ends))
+            
+            first_rows = []
+            next_row = 1
+            for count in counts:
+                first_rows.append(next_row)
+                next_row += count
+            
+            shard_files = [os.path.join(shard_dir, f"shard{i:05d}.csv") for i in range(len(ranges))]
+            futures = [
+                pool.submit(score_shard, input_filename, header, start, end, first_row, shard_file,
+                            chunk_size, output_format)
+                for (start, end), first_row, shard_file in zip(ranges, first_rows, shard_files)
+            ]
+            rows_scored = sum(future.result() for future in futures)
+        
+        with open(output_filename, 'w', newline='') as output:
+            write_score_header(output, output_format)
+            for shard_file in shard_files:
+                with open(shard_file, 'r', newline='') as shard:
+                    shutil.copyfileobj(shard, output, 1 << 20)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    
+    elapsed = time.perf_counter() - start_time
+    rows_per_sec = rows_scored / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Scored {rows_scored:,} rows with {workers} workers in {elapsed:.2f}s ({rows_per_sec:,.0f} rows/sec)")
+    
+    return {'rows': rows_scored, 'seconds': elapsed, 'rows_per_sec': rows_per_sec, 'workers': workers}
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) < 3:
+        print("Usage: python loan_parallel.py INPUT OUTPUT [WORKERS]")
+        sys.exit(1)
+    
+    score_csv_file_parallel(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None)
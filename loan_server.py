@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Loan Scoring HTTP Service
+Asyncio server that coalesces concurrent requests into vectorized batch predictions
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from loan_metrics import METRICS
+from simple_loan_predictor import (
+    FEATURE_ORDER, RISK_LEVELS, get_default_model, get_model_reloader, predict_loan_default_batch, use_model_file
+)
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+class RequestError(Exception):
+    """A client error that maps to an HTTP status code"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def features_to_row(customer_data):
+    """
+    Convert a JSON feature object to a row in FEATURE_ORDER
+    
+    Args:
+        customer_data (dict): Feature name to number; missing features count as 0
+    
+    Returns:
+        list: Feature values in FEATURE_ORDER
+    """
+    if not isinstance(customer_data, dict):
+        raise RequestError(400, "Each customer must be a JSON object of features")
+    try:
+        return [float(customer_data.get(name, 0)) for name in FEATURE_ORDER]
+    except (TypeError, ValueError):
+        raise RequestError(400, "Feature values must be numbers")
+
+def batch_results(result):
+    """
+    Split a batch prediction into one result dict per row
+    
+    Args:
+        result (dict): Result of predict_loan_default_batch
+    
+    Returns:
+        list: Dicts shaped like the result of predict_loan_default
+    """
+    return [
+        {
+            'probability': probability,
+            'predicted_default': prediction,
+            'risk_level': RISK_LEVELS[risk_code],
+            'recommendation': recommendation
+        }
+        for probability, prediction, risk_code, recommendation in zip(
+            result['probability'].tolist(),
+            result['predicted_default'].tolist(),
+            result['risk_level'].tolist(),
+            result['recommendation']
+        )
+    ]
+
+class MicroBatcher:
+    """
+    Collect single-customer requests and score them together
+    
+    The first queued request opens a window of window_ms milliseconds; the
+    batch is scored when the window closes or max_batch requests are
+    waiting, whichever comes first. A window of 0 scores whatever is
+    already queued without waiting.
+    """
+    
+    def __init__(self, window_ms=2.0, max_batch=256):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.full = asyncio.Event()
+        self.batches = 0
+        self.requests = 0
+        self._task = None
+    
+    def start(self):
+        """Start the background batching task"""
+        self._task = asyncio.ensure_future(self._run())
+    
+    async def stop(self):
+        """Stop the batching task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    async def score(self, row):
+        """
+        Queue one feature row and wait for its prediction
+        
+        Args:
+            row (list): Feature values in FEATURE_ORDER
+        
+        Returns:
+            dict: Prediction result
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((row, future))
+        if self.queue.qsize() >= self.max_batch:
+            self.full.set()
+        return await future
+    
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            if self.window > 0 and self.queue.qsize() + 1 < self.max_batch:
+                try:
+                    await asyncio.wait_for(self.full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            self.full.clear()
+            
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                results = batch_results(predict_loan_default_batch(np.array([row for row, _ in batch])))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+class ScoringServer:
+    """Minimal HTTP/1.1 server with /score, /score_batch, /health and optional /metrics routes"""
+    
+    def __init__(self, window_ms=2.0, max_batch=256):
+        self.batcher = MicroBatcher(window_ms, max_batch)
+        self.started = time.time()
+    
+    async def handle_score(self, body):
+        return await self.batcher.score(features_to_row(body))
+    
+    async def handle_score_batch(self, body):
+        customers = body.get('customers') if isinstance(body, dict) else body
+        if not isinstance(customers, list):
+            raise RequestError(400, "Expected a list of customers or {\"customers\": [...]}")
+        if not customers:
+            return {'results': []}
+        rows = [features_to_row(customer) for customer in customers]
+        return {'results': batch_results(predict_loan_default_batch(np.array(rows)))}
+    
+    def handle_health(self):
+        reloader = get_model_reloader()
+        return {
+            'status': 'ok',
+            'uptime_seconds': time.time() - self.started,
+            'requests_batched': self.batcher.requests,
+            'batches': self.batcher.batches,
+            'model': reloader.status() if reloader else {'version': 'built-in'}
+        }
+    
+    async def dispatch(self, method, path, body):
+        """Route a request and return (status, JSON-serializable payload or plain text)"""
+        path = path.split('?', 1)[0]
+        if path == '/health':
+            if method != 'GET':
+                raise RequestError(405, "Use GET")
+            return 200, self.handle_health()
+        if path == '/metrics' and METRICS.enabled:
+            if method != 'GET':
+                raise RequestError(405, "Use GET")
+            return 200, METRICS.to_prometheus()
+        
+        routes = {'/score': self.handle_score, '/score_batch': self.handle_score_batch}
+        if path not in routes:
+            raise RequestError(404, f"Unknown route {path}")
+        if method != 'POST':
+            raise RequestError(405, "Use POST")
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError(400, "Request body must be JSON")
+        return 200, await routes[path](payload)
+    
+    async def handle_connection(self, reader, writer):
+        """
+        Serve requests on one keep-alive connection
+        
+        A request whose body is not read (too large or an invalid
+        Content-Length) is answered with Connection: close and ends the
+        connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                body = None
+                try:
+                    try:
+                        length = int(headers.get('content-length', 0))
+                    except ValueError:
+                        raise RequestError(400, "Invalid Content-Length") from None
+                    if length < 0:
+                        raise RequestError(400, "Invalid Content-Length")
+                    if length > MAX_BODY_BYTES:
+                        raise RequestError(413, "Request body too large")
+                    body = await reader.readexactly(length) if length else b''
+                    request_start = time.perf_counter() if METRICS.enabled else None
+                    status, payload = await self.dispatch(method, path, body)
+                    if request_start is not None:
+                        METRICS.observe('http_request', time.perf_counter() - request_start)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                    METRICS.count_error('http_request')
+                    if body is None:
+                        # The unread body would be parsed as the next request
+                        keep_alive = False
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                    METRICS.count_error('http_request')
+                
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), 'text/plain; version=0.0.4'
+                else:
+                    data, content_type = json.dumps(payload).encode(), 'application/json'
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host='127.0.0.1', port=8000):
+        """Run the server until cancelled"""
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"✓ Scoring service listening on http://{host}:{port} "
+              f"(batch window {self.batcher.window * 1000:g} ms, max batch {self.batcher.max_batch})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local loan scoring HTTP service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--batch-window-ms', type=float, default=2.0,
+                        help="How long the first request waits for others to join its batch")
+    parser.add_argument('--max-batch', type=int, default=256, help="Score as soon as this many requests wait")
+    parser.add_argument('--metrics', action='store_true',
+                        help="Record per-stage timings and serve them at GET /metrics (Prometheus text)")
+    parser.add_argument('--model', metavar='FILE',
+                        help="Serve a model file from loan_model_file.py, reloading it when it changes "
+                             "(default: $LOAN_MODEL_FILE, else the built-in coefficients)")
+    parser.add_argument('--model-check-interval', type=float, default=2.0,
+                        help="Seconds between checks for a new model file")
+    args = parser.parse_args(argv)
+    
+    if args.metrics:
+        METRICS.enable()
+    
+    # Load the model before listening, so a bad model file fails at startup
+    try:
+        if args.model:
+            use_model_file(args.model, args.model_check_interval)
+        get_default_model()
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not load model file: {e}")
+        return 1
+    
+    server = ScoringServer(args.batch_window_ms, args.max_batch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n✓ Scoring service stopped")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Streaming Dataset Statistics
+Mergeable online aggregates computed in one pass over chunks of loan data
+"""
+
+import math
+import time
+
+import numpy as np
+
+from loan_csv_reader import iter_column_chunks
+
+class RunningStats:
+    """
+    Count, mean, variance, min and max of a stream of numbers
+    
+    Chunks are combined with the parallel form of Welford's algorithm, so
+    partial results from different chunks or processes can be merged.
+    """
+    
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def update(self, values):
+        """
+        Add a chunk of values; NaN values are ignored
+        
+        Args:
+            values (array-like): Numbers to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+    
+    def merge(self, other):
+        """
+        Combine another RunningStats into this one
+        
+        Args:
+            other (RunningStats): Statistics of another part of the stream
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two values)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def std(self):
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+class QuantileSketch:
+    """
+    Approximate quantiles with a bounded relative error
+    
+    Values are counted in logarithmically sized buckets (as in DDSketch), so
+    any reported quantile is within relative_accuracy of a true value of the
+    stream. Sketches are merged by adding bucket counts.
+    """
+    
+    __slots__ = ('relative_accuracy', '_log_gamma', 'positive', 'negative', 'zero_count', 'count', 'min', 'max')
+    
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def _add_to_buckets(self, buckets, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        for key, count in zip(*np.unique(keys, return_counts=True)):
+            key = int(key)
+            buckets[key] = buckets.get(key, 0) + int(count)
+    
+    def _bucket_value(self, key):
+        # Midpoint of the bucket (gamma**(key-1), gamma**key] in relative terms
+        return 2 * math.exp(key * self._log_gamma) / (1 + math.exp(self._log_gamma))
+    
+    def update(self, values):
+        """
+        Add a chunk of values; NaN values are ignored
+        
+        Args:
+            values (array-like): Numbers to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.zero_count += int(np.count_nonzero(values == 0))
+        if (values > 0).any():
+            self._add_to_buckets(self.positive, values[values > 0])
+        if (values < 0).any():
+            self._add_to_buckets(self.negative, -values[values < 0])
+    
+    def merge(self, other):
+        """
+        Combine another QuantileSketch with the same accuracy into this one
+        
+        Args:
+            other (QuantileSketch): Sketch of another part of the stream
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q):
+        """
+        Estimate the q-th quantile
+        
+        Args:
+            q (float): Quantile between 0 and 1
+        
+        Returns:
+            float: Approximate quantile, or NaN if the sketch is empty
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(-self._bucket_value(key), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self._bucket_value(key), self.max)
+        return self.max
+
+class DatasetSummary:
+    """
+    Per-column statistics and label rate for a loan dataset
+    
+    Every column gets a RunningStats and a QuantileSketch. Summaries of
+    separate chunks or worker processes combine with merge().
+    """
+    
+    def __init__(self, columns, label_column='Loan_Status_label', relative_accuracy=0.01):
+        """
+        Args:
+            columns (list): Numeric columns to summarize
+            label_column (str): 0/1 target column for the label rate (None to skip)
+            relative_accuracy (float): Relative error of the quantile sketches
+        """
+        self.columns = list(columns)
+        self.label_column = label_column
+        self.rows = 0
+        self.stats = {name: RunningStats() for name in self.columns}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in self.columns}
+        self.label_stats = RunningStats()
+    
+    def update(self, chunk):
+        """
+        Add a chunk of data
+        
+        Args:
+            chunk (dict): Column name to array of values; all arrays have the
+                same length and missing columns are skipped
+        """
+        lengths = {len(values) for values in chunk.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns in a chunk must have the same length")
+        self.rows += lengths.pop() if lengths else 0
+        
+        for name in self.columns:
+            if name in chunk:
+                self.stats[name].update(chunk[name])
+                self.sketches[name].update(chunk[name])
+        if self.label_column and self.label_column in chunk:
+            self.label_stats.update(chunk[self.label_column])
+    
+    def merge(self, other):
+        """
+        Combine a summary of another part of the dataset into this one
+        
+        Args:
+            other (DatasetSummary): Summary over the same columns
+        """
+        if other.columns != self.columns or other.label_column != self.label_column:
+            raise ValueError("Cannot merge summaries of different columns")
+        self.rows += other.rows
+        for name in self.columns:
+            self.stats[name].merge(other.stats[name])
+            self.sketches[name].merge(other.sketches[name])
+        self.label_stats.merge(other.label_stats)
+    
+    @property
+    def label_count(self):
+        """Number of rows with label 1"""
+        return int(round(self.label_stats.mean * self.label_stats.count))
+    
+    @property
+    def label_rate(self):
+        """Share of rows with label 1"""
+        return self.label_stats.mean if self.label_stats.count else 0.0
+    
+    def quantile(self, column, q):
+        """Approximate q-th quantile of a column"""
+        return self.sketches[column].quantile(q)
+    
+    def to_dict(self, quantiles=(0.25, 0.5, 0.75, 0.95)):
+        """
+        Summary as plain data
+        
+        Args:
+            quantiles (tuple): Quantiles to report per column
+        
+        Returns:
+            dict: Row count, label rate and per-column statistics
+        """
+        columns = {}
+        for name in self.columns:
+            stats = self.stats[name]
+            columns[name] = {
+                'count': stats.count,
+                'mean': stats.mean if stats.count else None,
+                'variance': stats.variance,
+                'min': stats.min if stats.count else None,
+                'max': stats.max if stats.count else None,
+                'quantiles': {str(q): self.quantile(name, q) for q in quantiles}
+            }
+        return {
+            'rows': self.rows,
+            'label_count': self.label_count,
+            'label_rate': self.label_rate,
+            'columns': columns
+        }
+
+def iter_csv_column_chunks(filename, columns, chunk_size=100000):
+    """
+    Stream numeric columns of a CSV file as arrays, chunk by chunk
+    
+    Blank or non-numeric cells, and columns missing from the header,
+    become NaN.
+    
+    Args:
+        filename (str): Path to CSV file
+        columns (list): Columns to extract
+        chunk_size (int): Rows per chunk
+    
+    Yields:
+        dict: Column name to float64 array
+    """
+    with open(filename, 'r', newline='') as file:
+        for chunk in iter_column_chunks(file, columns, chunk_size, missing=math.nan, invalid='nan'):
+            yield {name: chunk[:, j].copy() for j, name in enumerate(columns)}
+
+def iter_array_chunks(columns, chunk_size=100000):
+    """
+    Slice equally long arrays (for example memory-mapped cache columns) into chunks
+    
+    Args:
+        columns (dict): Column name to array
+        chunk_size (int): Rows per chunk
+    
+    Yields:
+        dict: Column name to array slice
+    """
+    rows = len(next(iter(columns.values()))) if columns else 0
+    for start in range(0, rows, chunk_size):
+        yield {name: values[start:start + chunk_size] for name, values in columns.items()}
+
+def summarize_chunks(chunks, columns, label_column='Loan_Status_label'):
+    """
+    Build a DatasetSummary in one pass over chunks of data
+    
+    Args:
+        chunks (iterable): Dicts of column name to array
+        columns (list): Numeric columns to summarize
+        label_column (str): 0/1 target column (None to skip)
+    
+    Returns:
+        DatasetSummary: Statistics over all chunks
+    """
+    summary = DatasetSummary(columns, label_column)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary
+
+def summarize_csv(filename, columns, label_column='Loan_Status_label', chunk_size=100000, use_cache=False):
+    """
+    Summarize a CSV file in one streaming pass
+    
+    Parses the CSV text by default, which writes nothing to disk. With
+    use_cache the columnar cache is read instead, building it first if
+    needed; that pays off for a file that is summarized repeatedly.
+    Either way only one chunk is in memory at a time.
+    
+    Args:
+        filename (str): Path to CSV file
+        columns (list): Numeric columns to summarize
+        label_column (str): 0/1 target column (None to skip)
+        chunk_size (int): Rows per chunk
+        use_cache (bool): Read through loan_data_cache (default: parse the CSV)
+    
+    Returns:
+        DatasetSummary: Statistics for the file
+    """
+    wanted = list(columns) + ([label_column] if label_column else [])
+    if use_cache:
+        from loan_data_cache import ensure_cache, load_columns
+        
+        available = ensure_cache(filename)['columns']
+        cached = load_columns(filename, [name for name in wanted if name in available])
+        chunks = iter_array_chunks(cached, chunk_size)
+    else:
+        chunks = iter_csv_column_chunks(filename, wanted, chunk_size)
+    return summarize_chunks(chunks, columns, label_column)
+
+if __name__ == "__main__":
+    import json
+    import sys
+    
+    from simple_loan_predictor import FEATURE_ORDER
+    
+    source = sys.argv[1] if len(sys.argv) > 1 else 'loan_detection.csv'
+    
+    start = time.perf_counter()
+    summary = summarize_csv(source, FEATURE_ORDER)
+    print(json.dumps(summary.to_dict(), indent=2))
+    print(f"✓ Summarized {summary.rows:,} rows in {time.perf_counter() - start:.3f}s")
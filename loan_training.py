@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Logistic Regression Training
+Refits the 14-feature loan model with IRLS (Newton's method) while streaming the CSV in shards across worker processes
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from loan_csv_reader import DEFAULT_CHUNK_ROWS, iter_column_chunks
+from loan_parallel import _iter_range_lines, read_header, shard_byte_ranges
+from loan_model_file import save_model
+from simple_loan_predictor import FEATURE_ORDER, LoanModel
+
+DEFAULT_L2 = 1e-4
+DEFAULT_MAX_ITER = 25
+DEFAULT_TOLERANCE = 1e-10
+# Smallest fraction of a Newton step tried before giving up on the line search
+MIN_STEP_SIZE = 1e-6
+
+def shard_statistics(filename, header, start, end, weights, label_column='Loan_Status_label',
+                     chunk_size=DEFAULT_CHUNK_ROWS, derivatives=True):
+    """
+    Accumulate the log-loss, gradient and Hessian of one byte range
+    
+    The feature matrix gets a leading column of ones for the intercept.
+    Only one chunk of rows is in memory at a time; the result has a fixed
+    size whatever the size of the range. Without derivatives only the
+    log-loss is computed, which skips the Hessian's matrix product.
+    
+    Args:
+        filename (str): Path to CSV file
+        header (list): Column names of the CSV file
+        start (int): First byte of the range
+        end (int): End of the range (exclusive)
+        weights (numpy.ndarray): Intercept followed by the 14 coefficients
+        label_column (str): 0/1 target column
+        chunk_size (int): Rows per chunk
+        derivatives (bool): Also accumulate the gradient and Hessian
+    
+    Returns:
+        tuple: (rows, summed log-loss, gradient, Hessian); the gradient
+               and Hessian are None without derivatives
+    
+    Raises:
+        ValueError: If the label column is missing or not 0/1
+    """
+    if label_column not in header:
+        raise ValueError(f"'{label_column}' column not found in {filename}")
+    
+    weights = np.asarray(weights, dtype=np.float64)
+    n_weights = len(weights)
+    rows = 0
+    loss = 0.0
+    gradient = np.zeros(n_weights) if derivatives else None
+    hessian = np.zeros((n_weights, n_weights)) if derivatives else None
+    
+    lines = _iter_range_lines(filename, start, end)
+    for chunk in iter_column_chunks(lines, list(FEATURE_ORDER) + [label_column], chunk_size, header=header):
+        labels = chunk[:, -1]
+        if not np.isin(labels, (0, 1)).all():
+            raise ValueError(f"'{label_column}' must contain only 0 and 1")
+        
+        # Move the label column to the front and replace it with the intercept's ones
+        features = np.roll(chunk, 1, axis=1)
+        labels = features[:, 0].copy()
+        features[:, 0] = 1.0
+        
+        score = features @ weights
+        loss += float(np.sum(np.logaddexp(0, score) - labels * score))
+        rows += len(labels)
+        if not derivatives:
+            continue
+        
+        with np.errstate(over='ignore'):
+            probability = 1 / (1 + np.exp(-score))
+        gradient += features.T @ (probability - labels)
+        hessian += features.T @ (features * (probability * (1 - probability))[:, None])
+    
+    return rows, loss, gradient, hessian
+
+def train_logistic_regression(filename, workers=None, l2=DEFAULT_L2, max_iter=DEFAULT_MAX_ITER,
+                              tolerance=DEFAULT_TOLERANCE, label_column='Loan_Status_label',
+                              chunk_size=DEFAULT_CHUNK_ROWS, shards_per_worker=2, verbose=True):
+    """
+    Fit the logistic regression model out of core with IRLS
+    
+    Every iteration is one pass over the file. The file is split into
+    line-aligned byte ranges once; each worker process streams its ranges
+    and returns their summed gradient and Hessian, which are added up in
+    range order; only the memory of one chunk per worker is needed.
+    Newton steps are halved while they increase the loss; those trial
+    passes compute only the loss, and the accepted point gets one full
+    pass. If even a step of MIN_STEP_SIZE increases the loss, training
+    stops with the previous weights and is reported as not converged.
+    The L2 penalty
+    (on the coefficients, not the intercept) keeps the Hessian invertible
+    when a feature is constant.
+    
+    Args:
+        filename (str): Path to labelled CSV file
+        workers (int): Worker processes (default: number of CPUs; 1
+            trains in-process)
+        l2 (float): L2 penalty strength
+        max_iter (int): Maximum passes over the data
+        tolerance (float): Stop once the mean log-loss improves by less
+        label_column (str): 0/1 target column
+        chunk_size (int): Rows per chunk inside each worker
+        shards_per_worker (int): Ranges per worker, to even out the load
+        verbose (bool): Print the loss of every pass
+    
+    Returns:
+        dict: 'coefficients' (dict in FEATURE_ORDER), 'intercept', mean
+              'log_loss', 'rows', 'iterations', 'converged' and 'seconds'
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    
+    header, data_start = read_header(filename)
+    ranges = shard_byte_ranges(filename, workers * shards_per_worker, data_start)
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    
+    n_weights = len(FEATURE_ORDER) + 1
+    penalty = np.full(n_weights, l2)
+    penalty[0] = 0.0
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    mapper = pool.map if pool else map
+    
+    def evaluate(weights, derivatives=True):
+        rows, loss = 0, 0.0
+        gradient = np.zeros(n_weights)
+        hessian = np.zeros((n_weights, n_weights))
+        for shard in mapper(shard_statistics, repeat(filename), repeat(header), starts, ends, repeat(weights),
+                            repeat(label_column), repeat(chunk_size), repeat(derivatives)):
+            rows += shard[0]
+            loss += shard[1]
+            if derivatives:
+                gradient += shard[2]
+                hessian += shard[3]
+        if rows == 0:
+            raise ValueError(f"No rows to train on in {filename}")
+        # Mean log-loss plus the penalty, and its derivatives
+        loss = loss / rows + 0.5 * float(penalty @ weights ** 2)
+        if not derivatives:
+            return rows, loss, None, None
+        return rows, loss, gradient / rows + penalty * weights, hessian / rows + np.diag(penalty)
+    
+    try:
+        weights = np.zeros(n_weights)
+        rows, loss, gradient, hessian = evaluate(weights)
+        if verbose:
+            print(f"Pass 0: log-loss {loss:.6f} ({rows:,} rows, {len(ranges)} shards, {workers} workers)")
+        
+        converged = False
+        iterations = 0
+        step_size = 1.0
+        while iterations < max_iter:
+            if step_size == 1.0:
+                step = np.linalg.solve(hessian, gradient)
+            candidate = weights - step_size * step
+            iterations += 1
+            # Halved steps are line-search trials that only need the loss
+            _, new_loss, new_gradient, new_hessian = evaluate(candidate, derivatives=step_size == 1.0)
+            
+            if new_loss > loss:
+                if step_size <= MIN_STEP_SIZE:
+                    if verbose:
+                        print(f"Pass {iterations}: log-loss {new_loss:.6f} rose at the smallest step, "
+                              f"keeping the previous weights")
+                    break
+                step_size /= 2
+                if verbose:
+                    print(f"Pass {iterations}: log-loss {new_loss:.6f} rose, halving the step")
+                continue
+            
+            improvement = loss - new_loss
+            weights, loss = candidate, new_loss
+            if verbose:
+                print(f"Pass {iterations}: log-loss {loss:.6f}")
+            if improvement < tolerance:
+                converged = True
+                break
+            if step_size < 1.0 and iterations < max_iter:
+                # The accepted trial has no derivatives yet
+                iterations += 1
+                _, _, new_gradient, new_hessian = evaluate(weights)
+            gradient, hessian = new_gradient, new_hessian
+            step_size = 1.0
+    finally:
+        if pool:
+            pool.shutdown()
+    
+    return {
+        'coefficients': {name: float(weight) for name, weight in zip(FEATURE_ORDER, weights[1:])},
+        'intercept': float(weights[0]),
+        'log_loss': loss,
+        'rows': rows,
+        'iterations': iterations,
+        'converged': converged,
+        'seconds': time.perf_counter() - start_time
+    }
+
+def save_trained_model(result, filename, source=None, version=None):
+    """
+    Write a trained coefficient set as a versioned model file
+    
+    The threshold and risk bands are carried over from the current model
+    so the file describes a complete model; training statistics go into
+    its metadata.
+    
+    Args:
+        result (dict): Result of train_logistic_regression
+        filename (str): Path of the model file to write
+        source (str): Training file, recorded for reference
+        version (str): Model version (default: the current UTC time)
+    
+    Returns:
+        dict: The model document written
+    """
+    model = LoanModel(result['coefficients'], result['intercept'])
+    metadata = {
+        'trainer': 'loan_training IRLS',
+        'source': source,
+        'rows': result['rows'],
+        'log_loss': result['log_loss'],
+        'iterations': result['iterations'],
+        'converged': result['converged']
+    }
+    return save_model(model, filename, version, metadata)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the loan model out of core with IRLS")
+    parser.add_argument('input', nargs='?', default='loan_detection.csv', help="Labelled CSV file")
+    parser.add_argument('--out', default='loan_model.json', help="Model file to write (see loan_model_file.py)")
+    parser.add_argument('--version', help="Model version (default: the current UTC time)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs)")
+    parser.add_argument('--l2', type=float, default=DEFAULT_L2, help="L2 penalty strength")
+    parser.add_argument('--max-iter', type=int, default=DEFAULT_MAX_ITER)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--label-column', default='Loan_Status_label')
+    parser.add_argument('--evaluate', action='store_true', help="Report ROC-AUC of the new coefficients on the input")
+    args = parser.parse_args(argv)
+    
+    result = train_logistic_regression(args.input, args.workers, args.l2, args.max_iter,
+                                       label_column=args.label_column, chunk_size=args.chunk_size)
+    if result['converged']:
+        status = "converged"
+    elif result['iterations'] < args.max_iter:
+        status = "stopped: no step lowered the log-loss"
+    else:
+        status = "stopped at --max-iter"
+    passes = result['iterations'] + 1
+    rate = result['rows'] * passes / result['seconds'] if result['seconds'] > 0 else 0
+    print(f"\n✓ Trained on {result['rows']:,} rows in {passes} passes ({status}), "
+          f"{result['seconds']:.2f}s ({rate:,.0f} rows/sec)")
+    
+    print("\nCOEFFICIENTS = {")
+    for name, weight in result['coefficients'].items():
+        print(f"    '{name}': {weight:.4f},")
+    print("}")
+    print(f"INTERCEPT = {result['intercept']:.4f}")
+    
+    document = save_trained_model(result, args.out, args.input, args.version)
+    print(f"\n✓ Model {document['version']} written to {args.out}")
+    
+    if args.evaluate:
+        from loan_evaluation import evaluate_csv
+        
+        for label, model in (("Current", None), ("Retrained", LoanModel(result['coefficients'], result['intercept']))):
+            report = evaluate_csv(args.input, model=model, label_column=args.label_column)
+            print(f"📈 {label} model: ROC-AUC {report['roc_auc']:.4f}, log-loss {report['log_loss']:.4f}")
+
+if __name__ == "__main__":
+    main()
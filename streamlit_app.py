@@ -5,13 +5,51 @@ Streamlit Frontend for Loan Default Predictor
 """
 
 import streamlit as st
+import io
+import os
 import time
 import math
-from simple_loan_predictor import predict_loan_default
-import plotly.graph_objects as go
-import plotly.express as px
+from loan_metrics import METRICS
+from simple_loan_predictor import (
+    RISK_LEVELS, enable_result_cache, get_default_model, get_model_reloader, get_result_cache, iter_scored_rows,
+    parse_feature_csv, predict_loan_default, write_score_header, write_scored_rows
+)
 import numpy as np
 
+# Optional "analysing" pause before showing results, in seconds (off by default)
+ANALYSIS_DELAY_SECONDS = float(os.environ.get('LOAN_APP_ANALYSIS_DELAY', '0'))
+
+# Level of detail of the risk chart: sphere mesh points per axis and the
+# particle count at probability 1.0; a resolution of None draws a flat 2D chart
+DETAIL_LEVELS = {
+    'high': {'resolution': 50, 'particles': 100},
+    'medium': {'resolution': 24, 'particles': 40},
+    'low': {'resolution': 12, 'particles': 0},
+    '2d': {'resolution': None, 'particles': 30}
+}
+DEFAULT_DETAIL = os.environ.get('LOAN_APP_DETAIL', 'high')
+
+# Warn when a serialized figure exceeds this many bytes (0 disables the check)
+FIGURE_BUDGET_BYTES = int(os.environ.get('LOAN_APP_FIGURE_BUDGET', '0'))
+
+# What-if features and the (min, max) values scanned for each
+WHAT_IF_RANGES = {
+    'campaign': (1, 50),
+    'pdays': (0, 1000),
+    'previous': (0, 5)
+}
+# Largest number of values per axis in the two-feature heatmap
+WHAT_IF_MAX_AXIS_POINTS = 201
+
+# Bulk upload table: rows per page and the columns it can be sorted by
+BULK_PAGE_SIZES = (25, 50, 100, 500)
+BULK_SORT_COLUMNS = {
+    "Row": 'row',
+    "Probability": 'probability',
+    "Risk level": 'risk_code',
+    "Recommendation": 'recommendation'
+}
+
 # Page configuration
 st.set_page_config(
     page_title="Loan Approval System",
@@ -186,60 +224,40 @@ function createConfetti() {
 </script>
 """, unsafe_allow_html=True)
 
-def create_3d_risk_visualization(probability, risk_level):
-    """Create 3D visualization of risk assessment"""
-    
-    # Create 3D sphere representing risk
-    fig = go.Figure()
-    
-    # Create sphere data
-    u = np.linspace(0, 2 * np.pi, 50)
-    v = np.linspace(0, np.pi, 50)
+@st.cache_resource
+def prediction_cache():
+    """Result cache in front of predict_loan_default, shared by every session"""
+    return get_result_cache() or enable_result_cache()
+
+@st.cache_resource
+def sphere_mesh(resolution):
+    """Unit sphere coordinates (x, y, z) for the 3D risk visualization"""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
     x = np.outer(np.cos(u), np.sin(v))
     y = np.outer(np.sin(u), np.sin(v))
     z = np.outer(np.ones(np.size(u)), np.cos(v))
+    return x, y, z
+
+@st.cache_resource
+def risk_figure_template(resolution):
+    """
+    Prebuilt 3D risk figure: the sphere surface and the shared layout
     
-    # Color based on risk level
-    if risk_level == "Low Risk":
-        color = "green"
-        opacity = 0.3 + probability * 0.7
-    elif risk_level == "Medium Risk":
-        color = "orange" 
-        opacity = 0.4 + probability * 0.6
-    elif risk_level == "High Risk":
-        color = "red"
-        opacity = 0.5 + probability * 0.5
-    else:  # Very High Risk
-        color = "darkred"
-        opacity = 0.6 + probability * 0.4
+    The template is validated once by Plotly and then only read; requests
+    copy the parts they change.
     
-    fig.add_trace(go.Surface(
-        x=x, y=y, z=z,
-        colorscale=[[0, color], [1, color]],
-        opacity=opacity,
-        showscale=False
-    ))
+    Args:
+        resolution (int): Sphere mesh points per axis
     
-    # Add risk indicator particles
-    n_particles = int(probability * 100)
-    if n_particles > 0:
-        particle_x = np.random.uniform(-2, 2, n_particles)
-        particle_y = np.random.uniform(-2, 2, n_particles)
-        particle_z = np.random.uniform(-2, 2, n_particles)
-        
-        fig.add_trace(go.Scatter3d(
-            x=particle_x, y=particle_y, z=particle_z,
-            mode='markers',
-            marker=dict(
-                size=3,
-                color=color,
-                opacity=0.6
-            ),
-            name="Risk Particles"
-        ))
+    Returns:
+        dict: Plotly figure dict with 'data' (the surface) and 'layout'
+    """
+    import plotly.graph_objects as go
     
+    x, y, z = sphere_mesh(resolution)
+    fig = go.Figure(go.Surface(x=x, y=y, z=z, showscale=False))
     fig.update_layout(
-        title=f"3D Risk Visualization - {risk_level}",
         scene=dict(
             xaxis_title="X",
             yaxis_title="Y", 
@@ -256,14 +274,15 @@ def create_3d_risk_visualization(probability, risk_level):
         plot_bgcolor="rgba(0,0,0,0)",
         height=400
     )
-    
-    return fig
+    return fig.to_plotly_json()
 
-def create_probability_gauge(probability):
-    """Create 3D-style probability gauge"""
+@st.cache_resource
+def gauge_figure_template():
+    """Prebuilt probability gauge figure dict; requests only set the value"""
+    import plotly.graph_objects as go
+    
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
-        value = probability * 100,
         domain = {'x': [0, 1], 'y': [0, 1]},
         title = {'text': "Default Probability (%)"},
         delta = {'reference': 50},
@@ -283,13 +302,183 @@ def create_probability_gauge(probability):
             }
         }
     ))
-    
     fig.update_layout(
         paper_bgcolor="rgba(0,0,0,0)",
         height=300
     )
+    return fig.to_plotly_json()
+
+@st.cache_resource
+def flat_risk_figure_template():
+    """Prebuilt 2D risk figure: a disc in place of the sphere, no 3D scene"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_shape(type="circle", x0=-1, y0=-1, x1=1, y1=1, line_width=0)
+    fig.update_xaxes(range=[-2, 2], visible=False)
+    fig.update_yaxes(range=[-2, 2], visible=False, scaleanchor="x")
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        showlegend=False,
+        height=400
+    )
+    return fig.to_plotly_json()
+
+def figure_from_template(data, layout):
+    """
+    Build a figure from template-derived parts without re-validating them
+    
+    Everything except the patched values was validated when the template
+    was built, so Plotly's per-property validation (the bulk of figure
+    construction time) is skipped.
+    """
+    import plotly.graph_objects as go
     
-    return fig
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
+
+def create_3d_risk_visualization(probability, risk_level, detail=DEFAULT_DETAIL):
+    """
+    Create 3D visualization of risk assessment
+    
+    Args:
+        probability (float): Default probability
+        risk_level (str): Risk level label
+        detail (str): Level of detail, a key of DETAIL_LEVELS ('2d' draws
+            a lightweight flat chart)
+    
+    Returns:
+        plotly.graph_objects.Figure: Risk figure
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail level {detail!r}; expected one of {', '.join(DETAIL_LEVELS)}")
+    resolution = DETAIL_LEVELS[detail]['resolution']
+    max_particles = DETAIL_LEVELS[detail]['particles']
+    
+    # Color based on risk level
+    if risk_level == "Low Risk":
+        color = "green"
+        opacity = 0.3 + probability * 0.7
+    elif risk_level == "Medium Risk":
+        color = "orange" 
+        opacity = 0.4 + probability * 0.6
+    elif risk_level == "High Risk":
+        color = "red"
+        opacity = 0.5 + probability * 0.5
+    else:  # Very High Risk
+        color = "darkred"
+        opacity = 0.6 + probability * 0.4
+    
+    if resolution is None:
+        return _flat_risk_figure(probability, risk_level, color, opacity, max_particles)
+    
+    template = risk_figure_template(resolution)
+    
+    # Sphere representing risk: only its colour and opacity change
+    data = [dict(template['data'][0], colorscale=[[0, color], [1, color]], opacity=opacity)]
+    
+    # Add risk indicator particles
+    n_particles = int(probability * max_particles)
+    if n_particles > 0:
+        particle_x = np.random.uniform(-2, 2, n_particles)
+        particle_y = np.random.uniform(-2, 2, n_particles)
+        particle_z = np.random.uniform(-2, 2, n_particles)
+        
+        data.append(dict(
+            type='scatter3d',
+            x=particle_x, y=particle_y, z=particle_z,
+            mode='markers',
+            marker=dict(
+                size=3,
+                color=color,
+                opacity=0.6
+            ),
+            name="Risk Particles"
+        ))
+    
+    layout = dict(template['layout'], title=dict(text=f"3D Risk Visualization - {risk_level}"))
+    
+    return figure_from_template(data, layout)
+
+def _flat_risk_figure(probability, risk_level, color, opacity, max_particles):
+    """2D version of the risk visualization for low-bandwidth clients"""
+    template = flat_risk_figure_template()
+    
+    data = []
+    n_particles = int(probability * max_particles)
+    if n_particles > 0:
+        data.append(dict(
+            type='scatter',
+            x=np.random.uniform(-2, 2, n_particles).round(2),
+            y=np.random.uniform(-2, 2, n_particles).round(2),
+            mode='markers',
+            marker=dict(size=5, color=color, opacity=0.6),
+            name="Risk Particles"
+        ))
+    
+    layout = dict(
+        template['layout'],
+        shapes=[dict(template['layout']['shapes'][0], fillcolor=color, opacity=opacity)],
+        title=dict(text=f"Risk Visualization - {risk_level}")
+    )
+    
+    return figure_from_template(data, layout)
+
+def create_probability_gauge(probability):
+    """Create 3D-style probability gauge"""
+    template = gauge_figure_template()
+    data = [dict(template['data'][0], value=probability * 100)]
+    
+    return figure_from_template(data, template['layout'])
+
+def measure_figure(build, *args):
+    """
+    Build a figure and time it
+    
+    Args:
+        build (callable): Figure builder, e.g. create_3d_risk_visualization
+        *args: Arguments for the builder
+    
+    Returns:
+        tuple: (figure, seconds to build)
+    """
+    start = time.perf_counter()
+    fig = build(*args)
+    seconds = time.perf_counter() - start
+    METRICS.observe('render_figure', seconds)
+    return fig, seconds
+
+@st.cache_data(show_spinner=False)
+def figure_payload(kind, detail=None):
+    """
+    Serialized size of a chart, measured once per chart kind and detail level
+    
+    Measured on the largest chart of its kind (probability 1.0 draws the
+    most particles), so the size is an upper bound for every render at
+    that level. st.plotly_chart serializes each figure itself; measuring
+    every render would serialize it a second time.
+    
+    Args:
+        kind (str): 'risk' or 'gauge'
+        detail (str): Detail level of the risk chart
+    
+    Returns:
+        tuple: (payload bytes, seconds to serialize)
+    """
+    if kind == 'risk':
+        fig = create_3d_risk_visualization(1.0, RISK_LEVELS[-1], detail)
+    else:
+        fig = create_probability_gauge(1.0)
+    start = time.perf_counter()
+    payload_bytes = len(fig.to_json().encode())
+    return payload_bytes, time.perf_counter() - start
+
+def show_figure_stats(build_seconds, payload_bytes, serialize_seconds):
+    """Show a chart's build time and payload size, warning above the budget"""
+    st.caption(f"Build: {build_seconds * 1000:.1f} ms · Payload: up to {payload_bytes / 1024:,.1f} KB · "
+               f"Serialization: {serialize_seconds * 1000:.1f} ms")
+    if FIGURE_BUDGET_BYTES and payload_bytes > FIGURE_BUDGET_BYTES:
+        st.warning(f"Chart payload {payload_bytes:,} bytes exceeds the budget of {FIGURE_BUDGET_BYTES:,} bytes")
 
 def show_approval_animation(probability):
     """Show approval message with confetti animation and score meter"""
@@ -364,8 +553,267 @@ def show_rejection_message(probability):
     </div>
     """, unsafe_allow_html=True)
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def score_uploaded_csv(data, signature, _model):
+    """
+    Parse and score an uploaded CSV file in one batch
+    
+    Cached on the file contents and model parameters, so paging and
+    sorting the results do not parse or score the file again, while a
+    reloaded model file scores it afresh.
+    
+    Args:
+        data (bytes): Uploaded CSV file
+        signature (tuple): Result of _model.signature(), the cache key
+        _model (LoanModel): Scoring model (not hashed by Streamlit)
+    
+    Returns:
+        tuple: (dict of result columns, scored CSV file as bytes)
+    """
+    features = parse_feature_csv(data.decode('utf-8-sig'))
+    result = _model.predict_batch(features)
+    
+    table = {
+        'row': np.arange(1, len(features) + 1),
+        'probability': result['probability'],
+        'predicted_default': result['predicted_default'],
+        'risk_level': np.array(RISK_LEVELS, dtype=object)[result['risk_level']],
+        'risk_code': result['risk_level'],
+        'recommendation': result['recommendation']
+    }
+    
+    output = io.StringIO()
+    write_score_header(output)
+    write_scored_rows(output, iter_scored_rows(result))
+    
+    return table, output.getvalue().encode()
+
+def show_bulk_upload_page():
+    """Score a whole CSV file of applications and browse the results"""
+    st.markdown("### Bulk Application Scoring")
+    uploaded = st.file_uploader(
+        "Upload a CSV file of applications", type="csv",
+        help="One application per row with the model's feature columns; missing columns count as 0"
+    )
+    if uploaded is None:
+        return
+    
+    start = time.perf_counter()
+    with st.spinner("Scoring applications..."):
+        try:
+            model = get_default_model()
+            table, scored_csv = score_uploaded_csv(uploaded.getvalue(), model.signature(), model)
+        except (ValueError, UnicodeDecodeError) as e:
+            st.error(f"Could not read {uploaded.name}: {e}")
+            return
+    elapsed = time.perf_counter() - start
+    
+    n_rows = len(table['row'])
+    if n_rows == 0:
+        st.warning(f"{uploaded.name} has no data rows")
+        return
+    
+    # Summary of the whole file
+    approved = int(np.count_nonzero(table['predicted_default'] == 0))
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Applications", f"{n_rows:,}")
+    m2.metric("Approve", f"{approved:,}")
+    m3.metric("Review/Reject", f"{n_rows - approved:,}")
+    m4.metric("Mean Probability", f"{float(table['probability'].mean()):.1%}")
+    
+    risk_counts = np.bincount(table['risk_code'], minlength=len(RISK_LEVELS))
+    st.caption(" · ".join(f"{level}: {count:,}" for level, count in zip(RISK_LEVELS, risk_counts.tolist())))
+    st.caption(f"Results ready in {elapsed * 1000:.0f} ms")
+    
+    st.download_button(
+        "Download scored CSV", scored_csv,
+        file_name=f"scored_{uploaded.name}", mime="text/csv"
+    )
+    
+    # Sorting and paging controls; only the current page is sent to the browser
+    c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
+    with c1:
+        sort_label = st.selectbox("Sort by", list(BULK_SORT_COLUMNS))
+    with c2:
+        descending = st.checkbox("Descending", value=sort_label == "Probability")
+    with c3:
+        page_size = st.selectbox("Rows per page", BULK_PAGE_SIZES, index=1)
+    n_pages = (n_rows + page_size - 1) // page_size
+    with c4:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1)
+    
+    keys = table[BULK_SORT_COLUMNS[sort_label]]
+    if descending:
+        # Sort the reversed keys so equal keys keep their original row order
+        order = (n_rows - 1) - np.argsort(keys[::-1], kind='stable')[::-1]
+    else:
+        order = np.argsort(keys, kind='stable')
+    rows = order[(page - 1) * page_size:page * page_size]
+    
+    st.dataframe(
+        {
+            "Row": table['row'][rows],
+            "Probability": table['probability'][rows].round(4),
+            "Risk Level": table['risk_level'][rows],
+            "Recommendation": table['recommendation'][rows]
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(f"Page {page} of {n_pages:,}")
+
+def what_if_values(name, max_points=None):
+    """Integer values scanned for a what-if feature, thinned to at most max_points"""
+    low, high = WHAT_IF_RANGES[name]
+    step = 1 if max_points is None else max(1, math.ceil((high - low) / (max_points - 1)))
+    values = np.arange(low, high + 1, step)
+    if values[-1] != high:
+        values = np.append(values, high)
+    return values
+
+def what_if_grid(model, features, x_name, y_name=None):
+    """
+    Score one applicant over a grid of values for one or two features
+    
+    Every grid point is a copy of the applicant with the chosen features
+    replaced, and the whole grid is scored with one predict_batch call.
+    
+    Args:
+        model (LoanModel): Scoring model
+        features (dict): The applicant's features
+        x_name (str): Feature varied along the x axis (a WHAT_IF_RANGES key)
+        y_name (str): Optional second feature, varied along the y axis
+    
+    Returns:
+        tuple: (x values, y values or None, probabilities shaped
+               (len(x),) or (len(y), len(x)))
+    """
+    base = np.array([float(features.get(name, 0)) for name in model.feature_names])
+    x_index = model.feature_names.index(x_name)
+    
+    if y_name is None:
+        xs = what_if_values(x_name)
+        grid = np.tile(base, (len(xs), 1))
+        grid[:, x_index] = xs
+        return xs, None, model.predict_batch(grid)['probability']
+    
+    xs = what_if_values(x_name, WHAT_IF_MAX_AXIS_POINTS)
+    ys = what_if_values(y_name, WHAT_IF_MAX_AXIS_POINTS)
+    grid = np.tile(base, (len(xs) * len(ys), 1))
+    grid[:, x_index] = np.tile(xs, len(ys))
+    grid[:, model.feature_names.index(y_name)] = np.repeat(ys, len(xs))
+    return xs, ys, model.predict_batch(grid)['probability'].reshape(len(ys), len(xs))
+
+def decision_flips(values, probabilities, threshold):
+    """
+    Find where the decision changes along a probability curve
+    
+    Args:
+        values (numpy.ndarray): Feature values, in increasing order
+        probabilities (numpy.ndarray): Probability at each value
+        threshold (float): Decision threshold
+    
+    Returns:
+        list: (value before the flip, value after it, new recommendation)
+    """
+    rejected = probabilities > threshold
+    return [
+        (values[i].item(), values[i + 1].item(), "REVIEW/REJECT" if rejected[i + 1] else "APPROVE")
+        for i in np.flatnonzero(rejected[1:] != rejected[:-1])
+    ]
+
+def create_what_if_figure(model, features, x_name, y_name=None):
+    """
+    Plot the probability curve (one feature) or heatmap (two features)
+    against the decision threshold
+    
+    Returns:
+        tuple: (figure, list of decision flips along the curve, or None for a heatmap)
+    """
+    import plotly.graph_objects as go
+    
+    xs, ys, probabilities = what_if_grid(model, features, x_name, y_name)
+    current_x = float(features.get(x_name, 0))
+    
+    if ys is None:
+        fig = go.Figure(go.Scatter(
+            x=xs, y=probabilities.round(5), mode='lines', name="Default probability",
+            line=dict(color="#3498db", width=3)
+        ))
+        fig.add_hline(y=model.threshold, line_dash="dash", line_color="red",
+                      annotation_text=f"Threshold {model.threshold:.0%}")
+        flips = decision_flips(xs, probabilities, model.threshold)
+        for _, after, _ in flips:
+            fig.add_vline(x=after, line_dash="dot", line_color="gray")
+        fig.add_trace(go.Scatter(
+            x=[current_x], y=[model.predict(features).probability], mode='markers',
+            marker=dict(size=12, color="black"), name="Current applicant"
+        ))
+        fig.update_layout(xaxis_title=x_name, yaxis_title="Default probability",
+                          yaxis=dict(range=[0, 1]), showlegend=False)
+    else:
+        fig = go.Figure(go.Heatmap(
+            x=xs, y=ys, z=probabilities.round(4), zmin=0, zmax=1, colorscale="RdYlGn_r",
+            colorbar=dict(title="Probability")
+        ))
+        # Threshold contour: the boundary between APPROVE and REVIEW/REJECT
+        fig.add_trace(go.Contour(
+            x=xs, y=ys, z=probabilities.round(4), showscale=False, hoverinfo='skip',
+            contours=dict(start=model.threshold, end=model.threshold, size=1, coloring='none'),
+            line=dict(color="black", width=3)
+        ))
+        fig.add_trace(go.Scatter(
+            x=[current_x], y=[float(features.get(y_name, 0))], mode='markers',
+            marker=dict(size=12, color="black", symbol="x"), name="Current applicant"
+        ))
+        fig.update_layout(xaxis_title=x_name, yaxis_title=y_name, showlegend=False)
+        flips = None
+    
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", height=400,
+                      margin=dict(t=30))
+    return fig, flips
+
+def show_what_if_panel(features):
+    """What-if sensitivity analysis for the last analysed applicant"""
+    st.markdown("### What-If Analysis")
+    st.caption("See how the result changes as one or two contact features change, without resubmitting")
+    
+    names = list(WHAT_IF_RANGES)
+    c1, c2 = st.columns(2)
+    with c1:
+        x_name = st.selectbox("Vary", names, index=names.index('pdays'))
+    with c2:
+        y_choice = st.selectbox("Against (optional)", ["None"] + [name for name in names if name != x_name])
+    y_name = None if y_choice == "None" else y_choice
+    
+    model = get_default_model()
+    fig, flips = create_what_if_figure(model, features, x_name, y_name)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if flips is None:
+        st.caption("The black line marks where the probability crosses the decision threshold")
+    elif flips:
+        for before, after, recommendation in flips:
+            st.info(f"Decision flips to {recommendation} between {x_name} = {before} and {after}")
+    else:
+        recommendation = predict_loan_default(features)['recommendation']
+        st.info(f"The decision stays {recommendation} for every {x_name} from "
+                f"{WHAT_IF_RANGES[x_name][0]} to {WHAT_IF_RANGES[x_name][1]}")
+
+def show_rerun_latency(rerun_start):
+    """Show how long this rerun took; with LOAN_METRICS=1 also record it and offer an export"""
+    seconds = time.perf_counter() - rerun_start
+    st.caption(f"Rerun latency: {seconds * 1000:.1f} ms")
+    
+    if METRICS.enabled:
+        METRICS.observe('streamlit_rerun', seconds)
+        with st.sidebar.expander("Metrics"):
+            st.download_button("Prometheus text", METRICS.to_prometheus(), file_name="loan_metrics.prom")
+            st.download_button("JSON", METRICS.to_json(), file_name="loan_metrics.json")
+
 def main():
     """Main Streamlit application"""
+    rerun_start = time.perf_counter()
     
     # Header with gradient background
     st.markdown("""
@@ -378,6 +826,26 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    view = st.sidebar.radio("View", ["Single application", "Bulk upload"])
+    
+    # With LOAN_MODEL_FILE set, the model reloads when the file changes
+    reloader = get_model_reloader()
+    if reloader is not None:
+        st.sidebar.caption(f"Model {reloader.document['version']}")
+    prediction_cache()
+    if view == "Bulk upload":
+        show_bulk_upload_page()
+        show_rerun_latency(rerun_start)
+        return
+    
+    # Chart level of detail; lower levels send much smaller figures
+    detail_names = list(DETAIL_LEVELS)
+    detail = st.sidebar.selectbox(
+        "Chart detail", detail_names,
+        index=detail_names.index(DEFAULT_DETAIL) if DEFAULT_DETAIL in DETAIL_LEVELS else 0,
+        help="Lower detail sends smaller charts for slow connections"
+    )
+    
     # Month options for the selectbox
     month_options = {
         "January": {"month_jan": 1}, "February": {"month_feb": 1}, "March": {"month_mar": 1},
@@ -522,6 +990,7 @@ def main():
                         'age': float(age),
                         'job': job,
                         'marital': marital,
+                        'campaign': float(campaign),
                         'pdays': float(pdays), 
                         'previous': float(previous),
                         'contact_cellular': float(contact_cellular),
@@ -543,8 +1012,10 @@ def main():
                     
                     # Make prediction
                     with st.spinner("AI is analyzing your application..."):
-                        time.sleep(2)  # Dramatic pause
+                        if ANALYSIS_DELAY_SECONDS > 0:
+                            time.sleep(ANALYSIS_DELAY_SECONDS)  # Dramatic pause
                         result = predict_loan_default(features)
+                    st.session_state['applicant'] = features
                     
                     # Display results
                     probability = result['probability']
@@ -566,14 +1037,17 @@ def main():
                     with viz_col1:
                         # Risk visualization
                         st.markdown("#### Risk Level")
-                        risk_fig = create_3d_risk_visualization(probability, risk_level)
+                        risk_fig, risk_seconds = measure_figure(
+                            create_3d_risk_visualization, probability, risk_level, detail)
                         st.plotly_chart(risk_fig, use_container_width=True)
+                        show_figure_stats(risk_seconds, *figure_payload('risk', detail))
                     
                     with viz_col2:
                         # Probability gauge
                         st.markdown("#### Default Probability")
-                        gauge_fig = create_probability_gauge(probability)
+                        gauge_fig, gauge_seconds = measure_figure(create_probability_gauge, probability)
                         st.plotly_chart(gauge_fig, use_container_width=True)
+                        show_figure_stats(gauge_seconds, *figure_payload('gauge'))
                     
                     # Model Information
                     st.markdown("### Model Information")
@@ -612,6 +1086,13 @@ def main():
                             <p>• Limit credit applications</p>
                         </div>
                         """, unsafe_allow_html=True)
+                
+                # Changing the what-if controls reruns the app without the
+                # button, so the panel works from the stored applicant
+                if 'applicant' in st.session_state:
+                    show_what_if_panel(st.session_state['applicant'])
+    
+    show_rerun_latency(rerun_start)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
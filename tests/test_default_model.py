@@ -0,0 +1,76 @@
+"""The default model and the result cache follow changes to the module's model parameters"""
+
+import pytest
+
+import simple_loan_predictor as predictor
+
+CUSTOMER = {name: 1.0 for name in predictor.FEATURE_ORDER}
+CUSTOMER.update(age=35, pdays=3)
+
+
+@pytest.fixture(params=[False, True], ids=['uncached', 'cached'])
+def cache(request):
+    """Run each test without and with the result cache in front of predict_loan_default"""
+    predictor.use_model_file(None)
+    cache = predictor.enable_result_cache() if request.param else None
+    yield cache
+    predictor.disable_result_cache()
+
+
+def test_changed_coefficient(cache, monkeypatch):
+    before = predictor.predict_loan_default(CUSTOMER)
+    monkeypatch.setitem(predictor.COEFFICIENTS, 'age', predictor.COEFFICIENTS['age'] * 2)
+    after = predictor.predict_loan_default(CUSTOMER)
+    assert after['probability'] > before['probability']
+    assert after == predictor.LoanModel().predict(CUSTOMER)._asdict()
+
+
+def test_changed_intercept(cache, monkeypatch):
+    before = predictor.predict_loan_default(CUSTOMER)
+    monkeypatch.setattr(predictor, 'INTERCEPT', predictor.INTERCEPT - 1)
+    assert predictor.predict_loan_default(CUSTOMER)['probability'] < before['probability']
+
+
+def test_changed_threshold(cache, monkeypatch):
+    before = predictor.predict_loan_default(CUSTOMER)
+    # Move the threshold to the other side of the probability
+    probability = before['probability']
+    threshold = (1 + probability) / 2 if before['predicted_default'] else probability / 2
+    monkeypatch.setattr(predictor, 'OPTIMAL_THRESHOLD', threshold)
+    after = predictor.predict_loan_default(CUSTOMER)
+    assert after['probability'] == before['probability']
+    assert after['predicted_default'] != before['predicted_default']
+    assert after['recommendation'] != before['recommendation']
+
+
+def test_replaced_coefficients(cache, monkeypatch):
+    before = predictor.predict_loan_default(CUSTOMER)
+    monkeypatch.setattr(predictor, 'COEFFICIENTS', {name: 0.0 for name in predictor.FEATURE_ORDER})
+    assert predictor.predict_loan_default(CUSTOMER)['probability'] != before['probability']
+    # In-place changes of the new dict are tracked as well
+    predictor.COEFFICIENTS['age'] = 0.1
+    assert predictor.predict_loan_default(CUSTOMER) == predictor.LoanModel().predict(CUSTOMER)._asdict()
+
+
+def test_restored_parameters(cache, monkeypatch):
+    before = predictor.predict_loan_default(CUSTOMER)
+    with monkeypatch.context() as patch:
+        patch.setattr(predictor, 'INTERCEPT', 5.0)
+        assert predictor.predict_loan_default(CUSTOMER) != before
+    assert predictor.predict_loan_default(CUSTOMER) == before
+
+
+def test_used_entries_survive_eviction():
+    cache = predictor.ResultCache(max_size=2)
+    model = predictor.LoanModel()
+    first, second, third = ((float(age),) * 14 for age in (20, 30, 40))
+    cache.put(first, model.predict(CUSTOMER), model)
+    cache.put(second, model.predict(CUSTOMER), model)
+    assert cache.get(first, model) is not None
+    cache.put(third, model.predict(CUSTOMER), model)
+    # The unused entry goes first, even though it is newer
+    assert cache.get(second, model) is None
+    assert cache.get(first, model) is not None
+    assert cache.get(third, model) is not None
+    assert cache.stats()['evictions'] == 1
+    assert (cache.hits, cache.misses) == (3, 1)
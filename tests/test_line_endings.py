@@ -0,0 +1,76 @@
+"""CSV entry points give the same results for Unix and old Mac (bare '\r') line endings"""
+
+import numpy as np
+import pytest
+
+from generate_loan_data import write_loan_csv
+from loan_csv_reader import read_columns
+from loan_evaluation import evaluate_csv
+from loan_parallel import score_csv_file_parallel
+from loan_stats import summarize_csv
+from loan_training import train_logistic_regression
+from simple_loan_predictor import FEATURE_ORDER, parse_feature_csv, score_csv_file
+
+
+@pytest.fixture(scope='module')
+def csv_files(tmp_path_factory):
+    """The same 3,000 rows with '\n' and with bare '\r' line endings"""
+    root = tmp_path_factory.mktemp('line_endings')
+    unix = root / 'unix.csv'
+    write_loan_csv(str(unix), 3000, seed=7)
+    mac = root / 'mac.csv'
+    mac.write_bytes(unix.read_bytes().replace(b'\n', b'\r'))
+    return str(unix), str(mac)
+
+
+def test_read_columns(csv_files):
+    unix, mac = csv_files
+    expected = read_columns(unix, FEATURE_ORDER, chunk_size=700)
+    assert expected.shape == (3000, len(FEATURE_ORDER))
+    assert np.array_equal(read_columns(mac, FEATURE_ORDER, chunk_size=700), expected)
+
+
+def test_parse_feature_csv(csv_files):
+    unix, mac = csv_files
+    with open(unix, newline='') as file:
+        expected = parse_feature_csv(file.read())
+    with open(mac, newline='') as file:
+        assert np.array_equal(parse_feature_csv(file.read()), expected)
+
+
+def test_score_csv_file(csv_files, tmp_path):
+    unix, mac = csv_files
+    score_csv_file(unix, str(tmp_path / 'unix_out.csv'), chunk_size=700, progress_interval=None)
+    score_csv_file(mac, str(tmp_path / 'mac_out.csv'), chunk_size=700, progress_interval=None)
+    assert (tmp_path / 'mac_out.csv').read_bytes() == (tmp_path / 'unix_out.csv').read_bytes()
+
+
+def test_score_csv_file_parallel(csv_files, tmp_path):
+    unix, mac = csv_files
+    score_csv_file_parallel(unix, str(tmp_path / 'unix_out.csv'), workers=2, chunk_size=700)
+    score_csv_file_parallel(mac, str(tmp_path / 'mac_out.csv'), workers=2, chunk_size=700)
+    output = (tmp_path / 'mac_out.csv').read_bytes()
+    assert output == (tmp_path / 'unix_out.csv').read_bytes()
+    assert output.count(b'\n') == 3001
+
+
+def test_evaluate_csv(csv_files):
+    unix, mac = csv_files
+    expected = evaluate_csv(unix)
+    report = evaluate_csv(mac)
+    assert report['rows'] == expected['rows'] == 3000
+    assert report['roc_auc'] == expected['roc_auc']
+
+
+def test_summarize_csv(csv_files):
+    unix, mac = csv_files
+    expected = summarize_csv(unix, ['age', 'pdays'], chunk_size=700).to_dict()
+    assert summarize_csv(mac, ['age', 'pdays'], chunk_size=700).to_dict() == expected
+
+
+def test_train_logistic_regression(csv_files):
+    unix, mac = csv_files
+    expected = train_logistic_regression(unix, workers=1, verbose=False)
+    result = train_logistic_regression(mac, workers=1, verbose=False)
+    assert result['rows'] == 3000
+    assert result['coefficients'] == expected['coefficients']
@@ -0,0 +1,102 @@
+"""LoanModel and predict_loan_default agree exactly with the original per-coefficient loop"""
+
+import math
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+import simple_loan_predictor as predictor
+
+
+def reference_prediction(customer_data):
+    """predict_loan_default as first written: a loop over COEFFICIENTS.items()"""
+    score = predictor.INTERCEPT
+    for feature, coefficient in predictor.COEFFICIENTS.items():
+        score += coefficient * customer_data.get(feature, 0)
+    probability = 1 / (1 + math.exp(-score))
+    prediction = 1 if probability > predictor.OPTIMAL_THRESHOLD else 0
+    if probability < 0.2:
+        risk_level = "Low Risk"
+    elif probability < 0.5:
+        risk_level = "Medium Risk"
+    elif probability < 0.8:
+        risk_level = "High Risk"
+    else:
+        risk_level = "Very High Risk"
+    return {
+        'probability': probability,
+        'predicted_default': prediction,
+        'risk_level': risk_level,
+        'recommendation': "REVIEW/REJECT" if prediction == 1 else "APPROVE"
+    }
+
+
+def random_customers(count, seed=0):
+    rng = random.Random(seed)
+    customers = []
+    for _ in range(count):
+        customer = {name: float(rng.random() < 0.5) for name in predictor.FEATURE_ORDER}
+        customer.update(age=rng.randint(18, 95), campaign=rng.randint(1, 40), pdays=rng.choice([999, 0, 3, 6]),
+                        previous=rng.randint(0, 6))
+        # Sparse dicts: missing features count as 0
+        for name in rng.sample(predictor.FEATURE_ORDER, rng.randint(0, 4)):
+            del customer[name]
+        customers.append(customer)
+    return customers
+
+
+@pytest.fixture(autouse=True)
+def default_model():
+    predictor.use_model_file(None)
+    predictor.disable_result_cache()
+
+
+def test_predict_loan_default_matches_reference():
+    for customer in random_customers(2000):
+        assert predictor.predict_loan_default(customer) == reference_prediction(customer)
+
+
+def test_model_predict_matches_reference():
+    model = predictor.LoanModel()
+    for customer in random_customers(2000, seed=1):
+        expected = reference_prediction(customer)
+        assert model.predict(customer)._asdict() == expected
+        assert model.predict([customer.get(name, 0) for name in model.feature_names])._asdict() == expected
+        decision = model.decide(customer)
+        assert (decision.predicted_default, decision.risk_level) == (expected['predicted_default'],
+                                                                     expected['risk_level'])
+
+
+def test_without_probability():
+    for customer in random_customers(500, seed=2):
+        expected = reference_prediction(customer)
+        expected['probability'] = None
+        assert predictor.predict_loan_default(customer, with_probability=False) == expected
+
+
+def test_pickled_model_scores_the_same():
+    model = predictor.LoanModel({'age': 0.05, 'pdays': -0.3}, intercept=-1.0, threshold=0.4)
+    copy = pickle.loads(pickle.dumps(model))
+    customer = {'age': 40, 'pdays': 3}
+    assert copy.signature() == model.signature()
+    assert copy.predict(customer) == model.predict(customer)
+
+
+@pytest.mark.parametrize('with_probability', [True, False])
+def test_predict_batch_matches_predict(with_probability):
+    model = predictor.LoanModel()
+    customers = random_customers(10000, seed=3)
+    rows = [[customer.get(name, 0) for name in model.feature_names] for customer in customers]
+    result = model.predict_batch(np.array(rows), with_probability)
+    for i, row in enumerate(rows):
+        expected = model.predict(row)
+        assert result['predicted_default'][i] == expected.predicted_default
+        assert predictor.RISK_LEVELS[result['risk_level'][i]] == expected.risk_level
+        if with_probability:
+            # numpy's exp is within 1 ulp of math.exp, and the division can add one more
+            assert abs(result['probability'][i] - expected.probability) <= 2 * math.ulp(expected.probability)
+    
+    scores = model._batch_score(np.array(rows))
+    assert scores.tolist() == [model._linear_score(row) for row in rows]
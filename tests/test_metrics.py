@@ -0,0 +1,92 @@
+"""Pipeline instrumentation: timing wrappers and error counters"""
+
+import pytest
+
+import simple_loan_predictor as predictor
+from generate_loan_data import write_loan_csv
+from loan_metrics import METRICS
+from loan_stats import summarize_csv
+from simple_loan_predictor import predict_loan_default
+
+CUSTOMER = {name: 1.0 for name in predictor.FEATURE_ORDER}
+BAD_ROWS = 4
+
+
+@pytest.fixture
+def metrics():
+    """The shared registry, enabled and empty for the test and disabled afterwards"""
+    METRICS.disable()
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+
+@pytest.fixture
+def bad_csv(tmp_path):
+    """1,000 rows, BAD_ROWS of them with non-numeric, blank or missing cells"""
+    path = tmp_path / 'bad.csv'
+    write_loan_csv(str(path), 1000, seed=3)
+    lines = path.read_text().splitlines()
+    for row, changes in ((10, {0: 'x'}), (20, {1: ''}), (30, {0: 'y', 2: 'z'})):
+        cells = lines[row].split(',')
+        for index, value in changes.items():
+            cells[index] = value
+        lines[row] = ','.join(cells)
+    # A short row
+    lines[40] = ','.join(lines[40].split(',')[:-2])
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def test_timing_wrappers_only_bound_while_enabled():
+    METRICS.disable()
+    plain = predictor.predict_loan_default
+    assert not hasattr(plain, '__wrapped__')
+    assert predict_loan_default is plain
+
+    METRICS.enable()
+    try:
+        assert predictor.predict_loan_default.__wrapped__ is plain
+        # The copy imported into this module is rebound as well
+        assert predict_loan_default is predictor.predict_loan_default
+        predict_loan_default(CUSTOMER)
+        predictor.predict_loan_default(CUSTOMER)
+        assert METRICS.to_dict()['score']['calls'] == 2
+    finally:
+        METRICS.disable()
+        METRICS.reset()
+
+    assert predictor.predict_loan_default is plain
+    assert predict_loan_default is plain
+    predict_loan_default(CUSTOMER)
+    assert 'score' not in METRICS.to_dict()
+
+
+def test_timed_errors(metrics):
+    with pytest.raises(AttributeError):
+        predictor.predict_loan_default(None)
+    assert metrics.to_dict()['score']['errors'] == 1
+
+
+def test_bad_rows_counted_where_detected(metrics, bad_csv):
+    summary = summarize_csv(bad_csv, list(predictor.FEATURE_ORDER), chunk_size=300)
+    assert summary.rows == 1000
+    assert metrics.to_dict()['parse_csv']['errors'] == BAD_ROWS
+    
+    metrics.reset()
+    failures = 0
+    for row in predictor.iter_csv_rows(bad_csv):
+        try:
+            predictor.convert_csv_row_to_features(row)
+        except (TypeError, ValueError):
+            failures += 1
+    assert failures == BAD_ROWS
+    assert metrics.to_dict()['parse_csv']['errors'] == BAD_ROWS
+    
+    # Strict parsing stops at the first bad row
+    metrics.reset()
+    with open(bad_csv, newline='') as file, pytest.raises(ValueError):
+        list(predictor.iter_csv_feature_chunks(file, chunk_size=300))
+    assert metrics.to_dict()['parse_csv']['errors'] == 1
@@ -0,0 +1,55 @@
+"""Keep-alive connections of the scoring server"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from loan_server import MAX_BODY_BYTES, ScoringServer
+
+HEALTH = b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n"
+
+
+def exchange(data):
+    """Send raw bytes on one connection and return everything the server sends back"""
+    async def run():
+        service = ScoringServer()
+        service.batcher.start()
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+        try:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            await writer.drain()
+            # Half-close, so a server that keeps the connection open still ends the read
+            writer.write_eof()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.batcher.stop()
+    return asyncio.run(run())
+
+
+def statuses(response):
+    return re.findall(rb'HTTP/1\.1 (\d{3}) ', response)
+
+
+def test_keep_alive():
+    body = json.dumps({'age': 35, 'pdays': 3}).encode()
+    score = b"POST /score HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    response = exchange(score + HEALTH)
+    assert statuses(response) == [b'200', b'200']
+    assert b'"risk_level"' in response and b'"status": "ok"' in response
+
+
+@pytest.mark.parametrize('length, status', [(MAX_BODY_BYTES + 1, b'413'), ('12x', b'400'), (-5, b'400')])
+def test_unread_body_closes_connection(length, status):
+    # The body looks like a request of its own; it must not be served as one
+    request = b"POST /score HTTP/1.1\r\nContent-Length: %s\r\n\r\n" % str(length).encode()
+    response = exchange(request + HEALTH + HEALTH)
+    assert statuses(response) == [status]
+    assert b'Connection: close' in response